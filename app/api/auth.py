@@ -12,6 +12,7 @@ from core.deps import (
     get_current_user,
     get_current_active_user,
     check_rate_limit,
+    UUIDPath,
 )
 from models.user import User
 from schemas.user import (
@@ -402,7 +403,7 @@ async def get_user_sessions(
     description="Revoke a specific user session."
 )
 async def revoke_session(
-    session_id: str,
+    session_id: UUIDPath,
     current_user: User = Depends(get_current_active_user),
     session: AsyncSession = Depends(get_async_session),
 ):
@@ -3,15 +3,17 @@ Dataset management API routes for uploading, managing, and processing datasets.
 """
 
 import os
-import uuid
 import json
 import csv
 import io
 from datetime import datetime
 from typing import List, Optional, Dict, Any
+
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query
+from fastapi.responses import Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, update, delete
+from sqlalchemy import select, func, update, delete, cast, Text
+from sqlalchemy.orm import defer, undefer
 
 from core.deps import (
     get_async_session,
@@ -19,6 +21,7 @@ from core.deps import (
     get_pagination_params,
     validate_file_upload,
     PaginationParams,
+    UUIDPath,
 )
 from models.user import User
 from models.dataset import Dataset
@@ -33,6 +36,7 @@ from schemas.dataset import (
     DatasetStats,
 )
 from core.config import settings
+from core.json import ORJSONResponse, dumps
 
 router = APIRouter(prefix="/datasets", tags=["Datasets"])
 
@@ -108,7 +112,6 @@ async def upload_dataset(
         
         # Create dataset
         dataset = Dataset(
-            id=str(uuid.uuid4()),
             name=name or file.filename,
             description=description,
             original_data=data,
@@ -132,7 +135,7 @@ async def upload_dataset(
         session.add(dataset)
         await session.commit()
         
-        return DatasetResponse.model_validate(dataset)
+        return ORJSONResponse(content=dataset.to_dict(), status_code=status.HTTP_201_CREATED)
         
     except HTTPException:
         raise
@@ -146,7 +149,9 @@ async def upload_dataset(
 
 @router.get(
     "/",
-    response_model=DatasetList,
+    response_model=None,
+    response_class=ORJSONResponse,
+    responses={200: {"model": DatasetList}},
     summary="List datasets",
     description="Get paginated list of datasets."
 )
@@ -175,8 +180,11 @@ async def list_datasets(
     Returns accessible datasets (owned by user or public).
     """
     try:
-        # Build base query
-        query = select(Dataset)
+        # Build base query (processing config/results aren't part of DatasetResponse)
+        query = select(Dataset).options(
+            defer(Dataset.processing_config),
+            defer(Dataset.processing_results),
+        )
         count_query = select(func.count(Dataset.id))
         
         # Apply access filter (own datasets or public ones)
@@ -225,20 +233,19 @@ async def list_datasets(
         result = await session.execute(query)
         datasets = result.scalars().all()
         
-        # Convert to response models
-        dataset_responses = [DatasetResponse.model_validate(dataset) for dataset in datasets]
-        
         # Calculate pagination info
         pages = (total + pagination.limit - 1) // pagination.limit
         page = (pagination.skip // pagination.limit) + 1
         
-        return DatasetList(
-            datasets=dataset_responses,
-            total=total,
-            page=page,
-            per_page=pagination.limit,
-            pages=pages,
-        )
+        # Dataset.to_dict mirrors DatasetResponse; encode it directly with
+        # orjson instead of validating a model per row
+        return ORJSONResponse(content={
+            "datasets": [dataset.to_dict() for dataset in datasets],
+            "total": total,
+            "page": page,
+            "per_page": pagination.limit,
+            "pages": pages,
+        })
         
     except Exception as e:
         raise HTTPException(
@@ -254,7 +261,7 @@ async def list_datasets(
     description="Get specific dataset with sample data."
 )
 async def get_dataset(
-    dataset_id: str,
+    dataset_id: UUIDPath,
     current_user: User = Depends(get_current_active_user),
     session: AsyncSession = Depends(get_async_session),
 ):
@@ -268,7 +275,11 @@ async def get_dataset(
     """
     try:
         # Get dataset
-        stmt = select(Dataset).where(Dataset.id == dataset_id)
+        stmt = (
+            select(Dataset)
+            .where(Dataset.id == dataset_id)
+            .options(undefer(Dataset.original_data))
+        )
         result = await session.execute(stmt)
         dataset = result.scalar_one_or_none()
         
@@ -285,19 +296,19 @@ async def get_dataset(
                 detail="Access denied. Dataset is private."
             )
         
-        # Create detailed response
-        dataset_detail = DatasetDetail.model_validate(dataset)
+        # Create detailed response from the trusted row (see Dataset.to_dict)
+        dataset_detail = dataset.to_dict()
         
         # Add sample data
-        dataset_detail.sample_data = dataset.get_sample_data(5)
+        dataset_detail["sample_data"] = dataset.get_sample_data(5)
         
         # Add column statistics
         column_stats = {}
         for column in dataset.columns:
             column_stats[column] = dataset.get_column_stats(column)
-        dataset_detail.column_stats = column_stats
+        dataset_detail["column_stats"] = column_stats
         
-        return dataset_detail
+        return ORJSONResponse(content=dataset_detail)
         
     except HTTPException:
         raise
@@ -315,7 +326,7 @@ async def get_dataset(
     description="Get dataset with complete data (owner only)."
 )
 async def get_dataset_data(
-    dataset_id: str,
+    dataset_id: UUIDPath,
     current_user: User = Depends(get_current_active_user),
     session: AsyncSession = Depends(get_async_session),
 ):
@@ -328,10 +339,15 @@ async def get_dataset_data(
     May be large response for big datasets.
     """
     try:
-        # Get dataset
-        stmt = select(Dataset).where(Dataset.id == dataset_id)
+        # Get dataset, with original_data as the database's own JSON text so
+        # the largest payload is never parsed into Python objects
+        stmt = (
+            select(Dataset, cast(Dataset.original_data, Text))
+            .where(Dataset.id == dataset_id)
+        )
         result = await session.execute(stmt)
-        dataset = result.scalar_one_or_none()
+        row = result.one_or_none()
+        dataset, original_data_json = row if row else (None, None)
         
         if not dataset:
             raise HTTPException(
@@ -346,7 +362,21 @@ async def get_dataset_data(
                 detail="Access denied. Full data access requires ownership."
             )
         
-        return DatasetWithData.model_validate(dataset)
+        payload = dataset.to_dict()
+        payload.update({
+            "processed_data": dataset.processed_data,
+            "processing_config": dataset.processing_config,
+            "processing_results": dataset.processing_results,
+        })
+        
+        # Splice the raw original_data text into the encoded object
+        body = b"".join((
+            dumps(payload)[:-1],
+            b',"original_data":',
+            original_data_json.encode(),
+            b"}",
+        ))
+        return Response(content=body, media_type="application/json")
         
     except HTTPException:
         raise
@@ -364,7 +394,7 @@ async def get_dataset_data(
     description="Update dataset information."
 )
 async def update_dataset(
-    dataset_id: str,
+    dataset_id: UUIDPath,
     update_data: DatasetUpdate,
     current_user: User = Depends(get_current_active_user),
     session: AsyncSession = Depends(get_async_session),
@@ -406,7 +436,7 @@ async def update_dataset(
         
         await session.commit()
         
-        return DatasetResponse.model_validate(dataset)
+        return ORJSONResponse(content=dataset.to_dict())
         
     except HTTPException:
         raise
@@ -425,7 +455,7 @@ async def update_dataset(
     description="Delete a dataset."
 )
 async def delete_dataset(
-    dataset_id: str,
+    dataset_id: UUIDPath,
     current_user: User = Depends(get_current_active_user),
     session: AsyncSession = Depends(get_async_session),
 ):
@@ -478,7 +508,7 @@ async def delete_dataset(
     description="Get detailed statistics for a dataset."
 )
 async def get_dataset_stats(
-    dataset_id: str,
+    dataset_id: UUIDPath,
     current_user: User = Depends(get_current_active_user),
     session: AsyncSession = Depends(get_async_session),
 ):
@@ -491,7 +521,11 @@ async def get_dataset_stats(
     """
     try:
         # Get dataset
-        stmt = select(Dataset).where(Dataset.id == dataset_id)
+        stmt = (
+            select(Dataset)
+            .where(Dataset.id == dataset_id)
+            .options(undefer(Dataset.original_data))
+        )
         result = await session.execute(stmt)
         dataset = result.scalar_one_or_none()
         
@@ -6,6 +6,7 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm import undefer
 import redis.asyncio as redis
 
 from core.deps import (
@@ -15,7 +16,9 @@ from core.deps import (
     get_rag_service,
     get_websocket_manager,
     get_redis,
+    UUIDPath,
 )
+from core.json import ORJSONResponse
 from models.user import User
 from models.dataset import Dataset
 from schemas.ml import (
@@ -33,12 +36,14 @@ router = APIRouter(prefix="/ml", tags=["Machine Learning"])
 
 @router.post(
     "/process/{dataset_id}",
-    response_model=ProcessingResult,
+    response_model=None,
+    response_class=ORJSONResponse,
+    responses={200: {"model": ProcessingResult}},
     summary="Process dataset",
     description="Process dataset with ML algorithms for 3D visualization."
 )
 async def process_dataset(
-    dataset_id: str,
+    dataset_id: UUIDPath,
     config: MLConfig,
     background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_active_user),
@@ -62,7 +67,11 @@ async def process_dataset(
     """
     try:
         # Get dataset
-        stmt = select(Dataset).where(Dataset.id == dataset_id)
+        stmt = (
+            select(Dataset)
+            .where(Dataset.id == dataset_id)
+            .options(undefer(Dataset.original_data))
+        )
         result = await session.execute(stmt)
         dataset = result.scalar_one_or_none()
         
@@ -127,17 +136,20 @@ async def process_dataset(
             print(f"RAG explanation failed: {e}")
         
         # Update dataset with results
-        dataset.set_processed(processing_result.model_dump())
+        result_data = processing_result.model_dump()
+        dataset.set_processed(result_data)
         await session.commit()
         
         # Notify WebSocket clients about completion
         await websocket_manager.notify_processing_completed(
             dataset_id=dataset_id,
-            result=processing_result.model_dump(),
+            result=result_data,
             user_id=current_user.id,
         )
         
-        return processing_result
+        # Encode the dump already made for storage; returning the model would
+        # make FastAPI re-validate every DataPoint against response_model
+        return ORJSONResponse(content=result_data)
         
     except HTTPException:
         # Update dataset status on HTTP errors
@@ -189,7 +201,7 @@ async def process_dataset(
     description="Get current processing progress for a dataset."
 )
 async def get_processing_progress(
-    dataset_id: str,
+    dataset_id: UUIDPath,
     current_user: User = Depends(get_current_active_user),
     session: AsyncSession = Depends(get_async_session),
     ml_processor: MLProcessor = Depends(get_ml_processor),
@@ -236,12 +248,14 @@ async def get_processing_progress(
 
 @router.get(
     "/results/{dataset_id}",
-    response_model=Optional[ProcessingResult],
+    response_model=None,
+    response_class=ORJSONResponse,
+    responses={200: {"model": Optional[ProcessingResult]}},
     summary="Get processing results",
     description="Get ML processing results for a dataset."
 )
 async def get_processing_results(
-    dataset_id: str,
+    dataset_id: UUIDPath,
     current_user: User = Depends(get_current_active_user),
     session: AsyncSession = Depends(get_async_session),
 ):
@@ -276,8 +290,9 @@ async def get_processing_results(
         if not dataset.is_processed or not dataset.processing_results:
             return None
         
-        # Return processing results
-        return ProcessingResult.model_validate(dataset.processing_results)
+        # Stored results were written from ProcessingResult.model_dump(), so
+        # encode them as-is rather than validating every point again
+        return ORJSONResponse(content=dataset.processing_results)
         
     except HTTPException:
         raise
@@ -294,7 +309,7 @@ async def get_processing_results(
     description="Generate AI explanations for dataset processing results."
 )
 async def generate_explanations(
-    dataset_id: str,
+    dataset_id: UUIDPath,
     language: str = "fr",
     current_user: User = Depends(get_current_active_user),
     session: AsyncSession = Depends(get_async_session),
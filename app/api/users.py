@@ -6,6 +6,7 @@ from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
+from sqlalchemy.orm import undefer
 
 from core.deps import (
     get_async_session,
@@ -13,7 +14,10 @@ from core.deps import (
     get_current_active_user,
     get_pagination_params,
     PaginationParams,
+    UUIDPath,
 )
+from core.json import ORJSONResponse
+from models.dataset import Dataset
 from models.user import User
 from schemas.user import (
     UserResponse,
@@ -51,7 +55,7 @@ async def list_users(
     """
     try:
         # Build query
-        query = select(User)
+        query = select(User).options(undefer(User.profile_image_url))
         count_query = select(func.count(User.id))
         
         # Apply filters
@@ -81,20 +85,19 @@ async def list_users(
         result = await session.execute(query)
         users = result.scalars().all()
         
-        # Convert to response models
-        user_responses = [UserResponse.model_validate(user) for user in users]
-        
         # Calculate pagination info
         pages = (total + pagination.limit - 1) // pagination.limit
         page = (pagination.skip // pagination.limit) + 1
         
-        return UserList(
-            users=user_responses,
-            total=total,
-            page=page,
-            per_page=pagination.limit,
-            pages=pages,
-        )
+        # User.to_dict already matches UserResponse, so skip per-user model
+        # validation and FastAPI's response re-encoding
+        return ORJSONResponse(content={
+            "users": [user.to_dict() for user in users],
+            "total": total,
+            "page": page,
+            "per_page": pagination.limit,
+            "pages": pages,
+        })
         
     except Exception as e:
         raise HTTPException(
@@ -110,7 +113,7 @@ async def list_users(
     description="Get specific user information by ID."
 )
 async def get_user_by_id(
-    user_id: str,
+    user_id: UUIDPath,
     current_user: User = Depends(get_current_active_user),
     session: AsyncSession = Depends(get_async_session),
 ):
@@ -142,9 +145,11 @@ async def get_user_by_id(
         # Convert to profile response
         user_profile = UserProfile.model_validate(user)
         
-        # Add additional statistics if needed
-        # TODO: Add dataset and visualization counts from relationships
-        user_profile.datasets_count = len(user.datasets) if user.datasets else 0
+        # Count datasets in SQL rather than loading the relationship
+        count_result = await session.execute(
+            select(func.count(Dataset.id)).where(Dataset.user_id == user.id)
+        )
+        user_profile.datasets_count = count_result.scalar() or 0
         
         return user_profile
         
@@ -164,7 +169,7 @@ async def get_user_by_id(
     description="Activate a user account (admin only)."
 )
 async def activate_user(
-    user_id: str,
+    user_id: UUIDPath,
     current_user: User = Depends(get_current_admin_user),
     session: AsyncSession = Depends(get_async_session),
 ):
@@ -207,7 +212,7 @@ async def activate_user(
     description="Deactivate a user account (admin only)."
 )
 async def deactivate_user(
-    user_id: str,
+    user_id: UUIDPath,
     current_user: User = Depends(get_current_admin_user),
     session: AsyncSession = Depends(get_async_session),
 ):
@@ -239,7 +244,7 @@ async def deactivate_user(
         user.deactivate()
         
         # Also logout user from all sessions
-        await auth_service.logout_user(user_id, all_sessions=True)
+        await auth_service.logout_user(user_id, all_sessions=True, commit=False)
         
         await session.commit()
         
@@ -262,7 +267,7 @@ async def deactivate_user(
     description="Permanently delete a user account (admin only)."
 )
 async def delete_user(
-    user_id: str,
+    user_id: UUIDPath,
     current_user: User = Depends(get_current_admin_user),
     session: AsyncSession = Depends(get_async_session),
 ):
@@ -311,7 +316,7 @@ async def delete_user(
     description="Get statistics for a specific user."
 )
 async def get_user_stats(
-    user_id: str,
+    user_id: UUIDPath,
     current_user: User = Depends(get_current_active_user),
     session: AsyncSession = Depends(get_async_session),
 ):
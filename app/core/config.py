@@ -16,9 +16,11 @@ class DatabaseSettings(BaseModel):
     
     url: str
     echo: bool = False
-    pool_size: int = 10
-    max_overflow: int = 20
+    pool_size: int = 20
+    max_overflow: int = 10
     pool_pre_ping: bool = True
+    pool_recycle: int = 3600
+    pool_timeout: int = 30
     
     model_config = ConfigDict(extra="forbid")
 
@@ -110,6 +112,10 @@ class Settings(BaseSettings):
     
     # Database
     database_url: str
+    database_pool_size: int = 20
+    database_max_overflow: int = 10
+    database_pool_recycle: int = 3600
+    database_pool_timeout: int = 30
     
     # Security
     secret_key: str
@@ -188,6 +194,10 @@ class Settings(BaseSettings):
         return DatabaseSettings(
             url=self.database_url,
             echo=self.debug,
+            pool_size=self.database_pool_size,
+            max_overflow=self.database_max_overflow,
+            pool_recycle=self.database_pool_recycle,
+            pool_timeout=self.database_pool_timeout,
         )
     
     @property
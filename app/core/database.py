@@ -4,8 +4,16 @@ Provides async database connections and session management.
 """
 
 import logging
-from typing import AsyncGenerator
-from sqlalchemy import create_engine, MetaData, event, text
+import os
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, AsyncGenerator, Optional
+
+import orjson
+from sqlalchemy import create_engine, MetaData, event, text, JSON, DateTime, Interval, TypeDecorator, Uuid
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     AsyncEngine,
@@ -15,8 +23,10 @@ from sqlalchemy.ext.asyncio import (
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
+from sqlalchemy.sql import expression
 
 from .config import settings
+from .json import dumps
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -34,6 +44,104 @@ metadata = MetaData(
 
 Base = declarative_base(metadata=metadata)
 
+# JSON column type: binary JSONB on PostgreSQL, plain JSON elsewhere (SQLite tests)
+JSONBType = JSON().with_variant(JSONB(), "postgresql")
+
+# ID column type: native 16-byte uuid on PostgreSQL, CHAR(32) elsewhere.
+# Values stay plain strings in Python so API and schema code is unchanged.
+UUIDType = Uuid(as_uuid=False)
+
+
+def uuid7() -> str:
+    """
+    Generate a time-ordered UUID (RFC 9562 version 7).
+    
+    The leading 48 bits are the Unix time in milliseconds, so ids created
+    close together land on the same B-tree pages instead of scattering
+    inserts across the whole index.
+    
+    Returns:
+        UUID string in canonical form
+    """
+    unix_ms = time.time_ns() // 1_000_000
+    value = bytearray(unix_ms.to_bytes(6, "big") + os.urandom(10))
+    value[6] = (value[6] & 0x0F) | 0x70  # version 7
+    value[8] = (value[8] & 0x3F) | 0x80  # RFC 4122 variant
+    return str(uuid.UUID(bytes=bytes(value)))
+
+
+class _UTCOffset(TypeDecorator):
+    """
+    Bind type for a utcnow() offset.
+    
+    PostgreSQL receives the timedelta as an interval and adds it server-side.
+    Other dialects have no interval arithmetic, so the offset is applied to
+    the application's UTC clock when the statement executes.
+    """
+    
+    impl = DateTime
+    cache_ok = True
+    
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(Interval())
+        return dialect.type_descriptor(DateTime())
+    
+    def process_bind_param(self, value, dialect):
+        if value is None or dialect.name == "postgresql":
+            return value
+        return datetime.utcnow() + value
+
+
+class utcnow(expression.FunctionElement):
+    """
+    Current UTC time evaluated by the database, as a naive timestamp.
+    
+    Timestamps in this schema are naive UTC, so plain now() would be shifted
+    by the server's TimeZone setting on PostgreSQL. An optional offset gives
+    ``now() + interval`` on PostgreSQL and a bound timestamp elsewhere.
+    """
+    
+    type = DateTime()
+    inherit_cache = True
+    
+    def __init__(self, offset: Optional[timedelta] = None):
+        if offset is None:
+            super().__init__()
+        else:
+            # A clause argument, so cached statements re-bind each offset
+            super().__init__(expression.literal(offset, _UTCOffset()))
+
+
+@compiles(utcnow)
+def _compile_utcnow_default(element, compiler, **kw):
+    if element.clauses.clauses:
+        return compiler.process(element.clauses.clauses[0], **kw)
+    # SQLite's CURRENT_TIMESTAMP is already UTC
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(utcnow, "postgresql")
+def _compile_utcnow_postgresql(element, compiler, **kw):
+    if element.clauses.clauses:
+        offset = compiler.process(element.clauses.clauses[0], **kw)
+        return f"(TIMEZONE('utc', CURRENT_TIMESTAMP) + {offset})"
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+def _json_serializer(value: Any) -> str:
+    """
+    Serialize JSON column values with orjson.
+    
+    Args:
+        value: Python value to serialize
+        
+    Returns:
+        JSON document as text
+    """
+    return dumps(value).decode()
+
+
 # Database engines
 async_engine: AsyncEngine = None
 sync_engine = None
@@ -56,9 +164,10 @@ def create_database_engines():
         pool_size=database_settings.pool_size,
         max_overflow=database_settings.max_overflow,
         pool_pre_ping=database_settings.pool_pre_ping,
-        # Connection pool settings for better performance
-        pool_recycle=3600,  # Recycle connections after 1 hour
-        pool_timeout=30,    # Timeout after 30 seconds
+        pool_recycle=database_settings.pool_recycle,
+        pool_timeout=database_settings.pool_timeout,
+        json_serializer=_json_serializer,
+        json_deserializer=orjson.loads,
     )
     
     # Create sync engine for migrations
@@ -69,8 +178,10 @@ def create_database_engines():
         pool_size=database_settings.pool_size,
         max_overflow=database_settings.max_overflow,
         pool_pre_ping=database_settings.pool_pre_ping,
-        pool_recycle=3600,
-        pool_timeout=30,
+        pool_recycle=database_settings.pool_recycle,
+        pool_timeout=database_settings.pool_timeout,
+        json_serializer=_json_serializer,
+        json_deserializer=orjson.loads,
     )
     
     # Create session makers
@@ -101,18 +212,6 @@ def create_database_engines():
             cursor.execute("PRAGMA temp_store=memory")
             cursor.close()
     
-    @event.listens_for(async_engine.sync_engine, "checkout")
-    def ping_connection(dbapi_connection, connection_record, connection_proxy):
-        """Ping connection on checkout to ensure it's alive."""
-        try:
-            cursor = dbapi_connection.cursor()
-            cursor.execute("SELECT 1")
-            cursor.close()
-        except Exception:
-            # Connection is dead, invalidate it
-            connection_proxy._pool.invalidate(dbapi_connection)
-            raise
-    
     logger.info("Database engines created successfully")
 
 
@@ -4,9 +4,11 @@ Provides common dependencies for authentication, database sessions, and services
 """
 
 import logging
-from typing import AsyncGenerator, Optional
+import uuid
+from typing import TYPE_CHECKING, Annotated, AsyncGenerator, Optional
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from pydantic import AfterValidator
 from sqlalchemy.ext.asyncio import AsyncSession
 import redis.asyncio as redis
 from ratelimit import limits, sleep_and_retry
@@ -17,10 +19,13 @@ from .security import verify_token, TokenError
 from .config import settings
 from models.user import User
 from services.auth import AuthService
-from services.ml_processor import MLProcessor
-from services.rag_service import RAGService
 from services.websocket import WebSocketManager
 
+if TYPE_CHECKING:
+    # Imported lazily in their providers; both pull in heavy ML/LLM libraries
+    from services.ml_processor import MLProcessor
+    from services.rag_service import RAGService
+
 # Security scheme
 security = HTTPBearer(auto_error=False)
 
@@ -30,6 +35,11 @@ redis_client: Optional[redis.Redis] = None
 # Logger
 logger = logging.getLogger(__name__)
 
+# Path parameter for UUID primary keys. Malformed ids are rejected with 422
+# before they reach the native uuid columns; valid ones arrive as canonical
+# strings, matching the ids models hold.
+UUIDPath = Annotated[uuid.UUID, AfterValidator(str)]
+
 
 async def get_redis() -> redis.Redis:
     """Get Redis connection."""
@@ -186,13 +196,17 @@ async def get_auth_service(
 
 async def get_ml_processor(
     redis_conn: redis.Redis = Depends(get_redis),
-) -> MLProcessor:
+) -> "MLProcessor":
     """Get ML processor service."""
+    from services.ml_processor import MLProcessor
+    
     return MLProcessor(redis_conn)
 
 
-async def get_rag_service() -> RAGService:
+async def get_rag_service() -> "RAGService":
     """Get RAG service."""
+    from services.rag_service import RAGService
+    
     return RAGService()
 
 
@@ -0,0 +1,51 @@
+"""
+Shared orjson encoding for API responses and JSON columns.
+"""
+
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from starlette.responses import JSONResponse
+
+# Matches stdlib json's leniency (int keys) and adds numpy scalars/arrays.
+# datetime, UUID and dataclass instances are encoded natively by orjson.
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(obj: Any) -> Any:
+    """
+    Encode types orjson does not handle natively.
+
+    Args:
+        obj: Object orjson could not serialize
+
+    Returns:
+        JSON-serializable replacement
+
+    Raises:
+        TypeError: If the type is not supported
+    """
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Serialize an object to JSON bytes.
+
+    Args:
+        obj: Object to serialize
+
+    Returns:
+        UTF-8 encoded JSON document
+    """
+    return orjson.dumps(obj, default=_default, option=ORJSON_OPTIONS)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with the shared orjson options and default."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
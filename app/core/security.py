@@ -3,14 +3,28 @@ Security utilities for authentication, password hashing, and JWT tokens.
 Provides comprehensive security features for the FastAPI application.
 """
 
+import base64
+import hashlib
+import hmac
+import json
+import os
 import secrets
-from datetime import datetime, timedelta
-from typing import Any, Union, Optional
+import time
+from datetime import timedelta
+from typing import Any, Union, Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from passlib.hash import bcrypt
 from pydantic import BaseModel
 
+try:
+    from cryptography.exceptions import InvalidSignature
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.hmac import HMAC
+    HAS_CRYPTOGRAPHY = True
+except ImportError:
+    HAS_CRYPTOGRAPHY = False
+
 from .config import settings
 
 
@@ -19,21 +33,45 @@ class TokenData(BaseModel):
     user_id: str
     email: str
     token_type: str = "access"
-    exp: Optional[datetime] = None
-    iat: Optional[datetime] = None
+    exp: Optional[int] = None  # Epoch seconds
+    iat: Optional[int] = None  # Epoch seconds
 
 
 # TokenResponse moved to schemas/user.py to avoid duplication
 
 
-# Password hashing context
+# Password hashing context. New hashes use Argon2id; bcrypt hashes are still
+# verified but deprecated, so they are rehashed on the next successful login.
+# Parameters are OWASP's 19 MiB / t=2 / p=1 profile: peak hashing memory is
+# memory_cost x concurrent hashes (capped per process in services.auth)
+# x worker processes, so keep memory_cost modest.
 pwd_context = CryptContext(
-    schemes=["bcrypt"],
+    schemes=["argon2", "bcrypt"],
     deprecated="auto",
+    argon2__type="ID",
+    argon2__time_cost=2,
+    argon2__memory_cost=19 * 1024,  # KiB
+    argon2__parallelism=1,
     bcrypt__rounds=12,
 )
 
 
+# Settings properties build a new model on every access, so token code reads
+# this snapshot and the constants derived from it instead
+_security_settings = settings.security_settings
+_SECRET_KEY_BYTES = _security_settings.secret_key.encode("utf-8")
+ACCESS_TOKEN_EXPIRE_SECONDS = _security_settings.access_token_expire_minutes * 60
+REFRESH_TOKEN_EXPIRE_SECONDS = _security_settings.refresh_token_expire_days * 86400
+
+# Pre-encoded JWT header for the HS256 fast path
+_JWT_HS256_HEADER = base64.urlsafe_b64encode(
+    b'{"alg":"HS256","typ":"JWT"}'
+).rstrip(b"=")
+
+# Claims the fast path knows how to serialize
+_FAST_PATH_CLAIMS = frozenset(("sub", "email"))
+
+
 class SecurityError(Exception):
     """Base security exception."""
     pass
@@ -66,9 +104,42 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         return False
 
 
+def verify_and_update_password(
+    plain_password: str,
+    hashed_password: str,
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and rehash it if its scheme or cost is outdated.
+    
+    Args:
+        plain_password: Plain text password
+        hashed_password: Hashed password from database
+        
+    Returns:
+        Tuple of (matches, replacement hash or None if the hash is current)
+    """
+    try:
+        return pwd_context.verify_and_update(plain_password, hashed_password)
+    except Exception:
+        return False, None
+
+
+def dummy_verify_password() -> None:
+    """
+    Spend the time of a real verification without a stored hash.
+    
+    Called when a login names an unknown email, so response time does not
+    reveal which emails have accounts.
+    """
+    try:
+        pwd_context.dummy_verify()
+    except Exception:
+        pass
+
+
 def get_password_hash(password: str) -> str:
     """
-    Hash a password using bcrypt.
+    Hash a password using Argon2id (bcrypt without argon2-cffi).
     
     Args:
         password: Plain text password
@@ -141,26 +212,14 @@ def create_access_token(
     try:
         to_encode = data.copy()
         
+        now = int(time.time())
+        
         if expires_delta:
-            expire = datetime.utcnow() + expires_delta
+            expire = now + int(expires_delta.total_seconds())
         else:
-            expire = datetime.utcnow() + timedelta(
-                minutes=settings.security_settings.access_token_expire_minutes
-            )
-        
-        to_encode.update({
-            "exp": expire,
-            "iat": datetime.utcnow(),
-            "token_type": "access"
-        })
+            expire = now + ACCESS_TOKEN_EXPIRE_SECONDS
         
-        encoded_jwt = jwt.encode(
-            to_encode,
-            settings.security_settings.secret_key,
-            algorithm=settings.security_settings.algorithm
-        )
-        
-        return encoded_jwt
+        return _encode_token(to_encode, expire, now, "access")
         
     except Exception as e:
         raise TokenError(f"Failed to create access token: {str(e)}")
@@ -186,31 +245,168 @@ def create_refresh_token(
     try:
         to_encode = data.copy()
         
+        now = int(time.time())
+        
         if expires_delta:
-            expire = datetime.utcnow() + expires_delta
+            expire = now + int(expires_delta.total_seconds())
         else:
-            expire = datetime.utcnow() + timedelta(
-                days=settings.security_settings.refresh_token_expire_days
-            )
-        
-        to_encode.update({
-            "exp": expire,
-            "iat": datetime.utcnow(),
-            "token_type": "refresh"
-        })
-        
-        encoded_jwt = jwt.encode(
-            to_encode,
-            settings.security_settings.secret_key,
-            algorithm=settings.security_settings.algorithm
-        )
+            expire = now + REFRESH_TOKEN_EXPIRE_SECONDS
         
-        return encoded_jwt
+        return _encode_token(to_encode, expire, now, "refresh")
         
     except Exception as e:
         raise TokenError(f"Failed to create refresh token: {str(e)}")
 
 
+def _encode_token(
+    to_encode: dict,
+    expire: int,
+    issued_at: int,
+    token_type: str
+) -> str:
+    """
+    Encode a token payload, using the HS256 fast path when possible.
+    
+    Tokens carrying exactly ``sub`` and ``email`` string claims are signed
+    directly; any other payload shape or algorithm goes through jose.
+    """
+    security_settings = _security_settings
+    
+    if (
+        security_settings.algorithm == "HS256"
+        and to_encode.keys() == _FAST_PATH_CLAIMS
+        and isinstance(to_encode["sub"], str)
+        and isinstance(to_encode["email"], str)
+    ):
+        return _encode_hs256_fixed(
+            _SECRET_KEY_BYTES,
+            to_encode["sub"],
+            to_encode["email"],
+            expire,
+            issued_at,
+            token_type,
+        )
+    
+    to_encode.update({
+        "exp": expire,
+        "iat": issued_at,
+        "token_type": token_type
+    })
+    
+    return jwt.encode(
+        to_encode,
+        security_settings.secret_key,
+        algorithm=security_settings.algorithm
+    )
+
+
+def _encode_hs256_fixed(
+    key: bytes,
+    sub: str,
+    email: str,
+    exp: int,
+    iat: int,
+    token_type: str
+) -> str:
+    """
+    Build an HS256 JWT for the fixed ``{sub, email, exp, iat, token_type}`` shape.
+    
+    Produces the same claims as ``jwt.encode`` without the generic
+    dict -> JSON -> base64 pipeline.
+    """
+    payload = (
+        f'{{"sub":{json.dumps(sub)},"email":{json.dumps(email)},'
+        f'"exp":{exp},"iat":{iat},"token_type":"{token_type}"}}'
+    )
+    signing_input = (
+        _JWT_HS256_HEADER
+        + b"."
+        + base64.urlsafe_b64encode(payload.encode("ascii")).rstrip(b"=")
+    )
+    signature = _hs256_sign(key, signing_input)
+    
+    return (
+        signing_input
+        + b"."
+        + base64.urlsafe_b64encode(signature).rstrip(b"=")
+    ).decode("ascii")
+
+
+def _hs256_sign(key: bytes, message: bytes) -> bytes:
+    """Compute an HMAC-SHA256 signature, via OpenSSL when available."""
+    if HAS_CRYPTOGRAPHY:
+        mac = HMAC(key, hashes.SHA256())
+        mac.update(message)
+        return mac.finalize()
+    return hmac.new(key, message, hashlib.sha256).digest()
+
+
+def _hs256_verify(key: bytes, message: bytes, signature: bytes) -> bool:
+    """Check an HMAC-SHA256 signature in constant time."""
+    if HAS_CRYPTOGRAPHY:
+        mac = HMAC(key, hashes.SHA256())
+        mac.update(message)
+        try:
+            mac.verify(signature)
+            return True
+        except InvalidSignature:
+            return False
+    return hmac.compare_digest(
+        hmac.new(key, message, hashlib.sha256).digest(), signature
+    )
+
+
+def _b64url_decode(segment: str) -> bytes:
+    """Decode an unpadded base64url JWT segment."""
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def _decode_hs256(token: str, key: bytes) -> Optional[dict]:
+    """
+    Verify and decode an HS256 token carrying our own pre-encoded header.
+    
+    Returns None when the token uses another header so the caller can fall
+    back to jose.
+    
+    Raises:
+        TokenError: If the signature is invalid or the token has expired
+    """
+    header_b64, sep, rest = token.partition(".")
+    if not sep or header_b64.encode("ascii", "replace") != _JWT_HS256_HEADER:
+        return None
+    
+    payload_b64, sep, signature_b64 = rest.partition(".")
+    if not sep:
+        raise TokenError("Invalid token: Not enough segments")
+    if "." in signature_b64:
+        raise TokenError("Invalid token: Too many segments")
+    
+    try:
+        signature = _b64url_decode(signature_b64)
+        signing_input = token[:len(header_b64) + 1 + len(payload_b64)].encode("ascii")
+    except (ValueError, UnicodeEncodeError):
+        raise TokenError("Invalid token: Invalid crypto padding")
+    
+    if not _hs256_verify(key, signing_input, signature):
+        raise TokenError("Invalid token: Signature verification failed.")
+    
+    try:
+        payload = json.loads(_b64url_decode(payload_b64))
+    except ValueError:
+        raise TokenError("Invalid token: Invalid payload string")
+    if not isinstance(payload, dict):
+        raise TokenError("Invalid token: Invalid payload string")
+    
+    exp = payload.get("exp")
+    if exp is not None:
+        if not isinstance(exp, int):
+            raise TokenError("Invalid token: Expiration Time claim (exp) must be an integer.")
+        if exp < time.time():
+            raise TokenError("Token has expired")
+    
+    return payload
+
+
 def verify_token(token: str, token_type: str = "access") -> TokenData:
     """
     Verify and decode a JWT token.
@@ -226,11 +422,18 @@ def verify_token(token: str, token_type: str = "access") -> TokenData:
         TokenError: If token is invalid, expired, or wrong type
     """
     try:
-        payload = jwt.decode(
-            token,
-            settings.security_settings.secret_key,
-            algorithms=[settings.security_settings.algorithm]
-        )
+        security_settings = _security_settings
+        payload = None
+        
+        if security_settings.algorithm == "HS256":
+            payload = _decode_hs256(token, _SECRET_KEY_BYTES)
+        
+        if payload is None:
+            payload = jwt.decode(
+                token,
+                security_settings.secret_key,
+                algorithms=[security_settings.algorithm]
+            )
         
         # Verify token type
         if payload.get("token_type") != token_type:
@@ -247,10 +450,12 @@ def verify_token(token: str, token_type: str = "access") -> TokenData:
             user_id=user_id,
             email=email,
             token_type=token_type,
-            exp=datetime.fromtimestamp(payload.get("exp", 0)),
-            iat=datetime.fromtimestamp(payload.get("iat", 0))
+            exp=payload.get("exp"),
+            iat=payload.get("iat")
         )
         
+    except TokenError:
+        raise
     except JWTError as e:
         if "expired" in str(e).lower():
             raise TokenError("Token has expired")
@@ -286,7 +491,7 @@ def create_token_pair(user_id: str, email: str) -> dict:
         return {
             "access_token": access_token,
             "refresh_token": refresh_token,
-            "expires_in": settings.security_settings.access_token_expire_minutes * 60
+            "expires_in": ACCESS_TOKEN_EXPIRE_SECONDS
         }
         
     except Exception as e:
@@ -300,7 +505,29 @@ def generate_reset_token() -> str:
     Returns:
         Random URL-safe token string
     """
-    return secrets.token_urlsafe(32)
+    return generate_reset_tokens(1)[0]
+
+
+def generate_reset_tokens(count: int, nbytes: int = 32) -> list[str]:
+    """
+    Generate several secure random URL-safe tokens at once.
+    
+    Randomness for the whole batch is read with a single ``os.urandom`` call
+    and sliced per token; each token has the same format as
+    ``secrets.token_urlsafe(nbytes)``.
+    
+    Args:
+        count: Number of tokens to generate
+        nbytes: Random bytes per token
+        
+    Returns:
+        List of random URL-safe token strings
+    """
+    raw = memoryview(os.urandom(nbytes * count))
+    return [
+        base64.urlsafe_b64encode(raw[offset:offset + nbytes]).rstrip(b"=").decode("ascii")
+        for offset in range(0, nbytes * count, nbytes)
+    ]
 
 
 def generate_api_key() -> str:
@@ -323,17 +550,48 @@ def mask_email(email: str) -> str:
     Returns:
         Masked email string
     """
-    if not email or "@" not in email:
+    at = email.find("@") if email else -1
+    if at < 0:
         return "***"
     
-    local, domain = email.split("@", 1)
+    if at <= 2:
+        return f"{'*' * at}{email[at:]}"
     
-    if len(local) <= 2:
-        masked_local = "*" * len(local)
-    else:
-        masked_local = local[0] + "*" * (len(local) - 2) + local[-1]
+    return f"{email[0]}{'*' * (at - 2)}{email[at - 1:]}"
+
+
+def mask_emails(emails: list[str]) -> list[str]:
+    """
+    Mask a batch of emails for privacy in logs.
+    
+    Star runs are built once per distinct length and reused across the batch.
+    
+    Args:
+        emails: Email addresses to mask
+        
+    Returns:
+        Masked email strings, in input order
+    """
+    stars: dict[int, str] = {}
+    masked = []
+    
+    for email in emails:
+        at = email.find("@") if email else -1
+        if at < 0:
+            masked.append("***")
+            continue
+        
+        count = at if at <= 2 else at - 2
+        run = stars.get(count)
+        if run is None:
+            run = stars[count] = "*" * count
+        
+        if at <= 2:
+            masked.append(f"{run}{email[at:]}")
+        else:
+            masked.append(f"{email[0]}{run}{email[at - 1:]}")
     
-    return f"{masked_local}@{domain}"
+    return masked
 
 
 def is_strong_password(password: str) -> tuple[bool, list[str]]:
@@ -4,122 +4,286 @@ Security middleware for additional protection layers.
 
 import re
 import logging
-from typing import Dict, Set
-from fastapi import Request, Response
+import ipaddress
+from typing import List, Optional, Pattern, Set, Tuple
+from urllib.parse import parse_qsl
+from fastapi import Request
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_CSP_POLICY = (
+    "default-src 'self'; "
+    "script-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net; "
+    "style-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net; "
+    "img-src 'self' data: https:; "
+    "connect-src 'self' ws: wss:; "
+    "frame-ancestors 'none'"
+)
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+# Constant security headers, encoded once at import as raw ASGI header tuples.
+# The Content-Security-Policy value is per instance and encoded in __init__.
+_STATIC_SECURITY_HEADERS = [
+    (name.lower().encode("ascii"), value.encode("ascii"))
+    for name, value in (
+        ("X-Content-Type-Options", "nosniff"),
+        ("X-Frame-Options", "DENY"),
+        ("X-XSS-Protection", "1; mode=block"),
+        ("Referrer-Policy", "strict-origin-when-cross-origin"),
+        ("Strict-Transport-Security", "max-age=31536000; includeSubDomains"),
+        ("Permissions-Policy", "geolocation=(), microphone=(), camera=()"),
+    )
+]
+_CSP_HEADER = b"content-security-policy"
+
+# Pre-encoded rejection bodies
+_INVALID_PATH_BODY = b'{"error":"Invalid request"}'
+_INVALID_PARAMS_BODY = b'{"error":"Invalid request parameters"}'
+_REQUEST_TOO_LARGE_BODY = b'{"error":"Request too large"}'
+
+DEFAULT_MAX_SIZE = 10 * 1024 * 1024  # 10MB
+DEFAULT_SKIP_PREFIXES = ("/health", "/docs", "/redoc", "/openapi.json")
+DEFAULT_SKIP_METHODS = ("OPTIONS",)
+
+SUSPICIOUS_PATTERNS = [
+    # SQL Injection patterns
+    r"(\b(SELECT|INSERT|UPDATE|DELETE|DROP|CREATE|ALTER|EXEC)\b)",
+    r"(\bunion\b.*\bselect\b)",
+    r"(\bor\b.*\b1\s*=\s*1\b)",
+    
+    # XSS patterns
+    r"<script[^>]*>.*?</script>",
+    r"javascript:",
+    r"on\w+\s*=",
+    
+    # Path traversal
+    r"\.\./",
+    r"\.\.\\",
+    
+    # Command injection
+    r"[;&|`$()]",
+    
+    # Template injection
+    r"\{\{.*\}\}",
+    r"\{%.*%\}",
+]
+
+# All patterns folded into one alternation so each string is scanned once
+_SUSPICIOUS_PATTERN = re.compile(
+    "|".join(f"(?:{pattern})" for pattern in SUSPICIOUS_PATTERNS),
+    re.IGNORECASE,
+)
+
+
+async def _send_json_error(send: Send, status_code: int, body: bytes) -> None:
+    """Send a pre-encoded JSON error response straight to the ASGI transport."""
+    await send({
+        "type": "http.response.start",
+        "status": status_code,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode("latin-1")),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+def _security_headers(csp_policy: str) -> Tuple[List[Tuple[bytes, bytes]], frozenset]:
+    """
+    Build the security headers for a CSP policy.
+    
+    Returns:
+        Raw headers appended to every response, and the header names dropped
+        from the app response: ``server`` plus every header we set ourselves,
+        so values are overridden rather than duplicated
+    """
+    headers = _STATIC_SECURITY_HEADERS + [(_CSP_HEADER, csp_policy.encode("ascii"))]
+    # ASGI header names are lowercase, so raw names match this set directly
+    return headers, frozenset([b"server"] + [name for name, _ in headers])
+
+
+def _wrap_send(send: Send, headers: List[Tuple[bytes, bytes]], dropped: frozenset) -> Send:
+    """Wrap an ASGI send callable so responses carry the given headers."""
+    async def send_with_headers(message: Message) -> None:
+        if message["type"] == "http.response.start":
+            message["headers"] = [
+                header for header in message.get("headers", ())
+                if header[0] not in dropped
+            ] + headers
+        await send(message)
+    
+    return send_with_headers
+
+
+def _skip_path_pattern(skip_prefixes: Tuple[str, ...]) -> Optional[Pattern]:
+    """
+    Fold known-safe path prefixes into one anchored regex.
+    
+    A prefix only matches a whole path segment, so "/healthz" is still scanned.
+    """
+    if not skip_prefixes:
+        return None
+    return re.compile(
+        "^(?:" + "|".join(re.escape(prefix) for prefix in skip_prefixes) + ")(?:/|$)"
+    )
+
+
+def _is_suspicious(text: str) -> bool:
+    """Check if text contains suspicious patterns."""
+    return _SUSPICIOUS_PATTERN.search(text) is not None
+
+
+def _check_input(
+    scope: Scope,
+    skip_methods: frozenset,
+    skip_path: Optional[Pattern],
+) -> Optional[bytes]:
+    """
+    Scan the request path and query string.
+    
+    Returns:
+        Pre-encoded error body if the request is suspicious, None otherwise
+    """
+    path = scope["path"]
+    
+    # Preflights and known-safe endpoints carry no surface we scan
+    if scope["method"] in skip_methods or (
+        skip_path is not None and skip_path.match(path) and ".." not in path
+    ):
+        return None
+    
+    # Check URL path
+    if _is_suspicious(path):
+        logger.warning(f"Suspicious URL path detected: {path}")
+        return _INVALID_PATH_BODY
+    
+    # Check query parameters
+    query_string = scope.get("query_string", b"")
+    if query_string:
+        for param, value in parse_qsl(query_string.decode("latin-1"), keep_blank_values=True):
+            if _is_suspicious(f"{param}={value}"):
+                logger.warning(f"Suspicious query parameter: {param}={value}")
+                return _INVALID_PARAMS_BODY
+    
+    return None
+
+
+def _is_too_large(scope: Scope, max_size: int, max_digits: int) -> bool:
+    """Return True if the declared content-length exceeds ``max_size``."""
+    for name, value in scope["headers"]:
+        if name == b"content-length":
+            if not value.isdigit():
+                return False
+            # More digits than the limit is always too large, no int parse needed
+            if len(value.lstrip(b"0")) > max_digits or int(value) > max_size:
+                logger.warning(f"Request too large: {value.decode('latin-1')} bytes")
+                return True
+            return False
+    return False
+
+
+class SecurityHeadersMiddleware:
     """
     Add security headers to all responses.
+    
+    Implemented as a pure ASGI middleware: headers are rewritten on the
+    ``http.response.start`` message in a single pass over the raw header list,
+    which also drops the ``Server`` header. Body messages are forwarded
+    untouched, so large responses stream straight to the transport instead
+    of going through ``BaseHTTPMiddleware``'s memory object stream.
+    
+    Register with ``app.add_middleware(SecurityHeadersMiddleware, csp_policy=...)``.
     """
     
-    def __init__(self, app, csp_policy: str = None):
-        super().__init__(app)
-        self.csp_policy = csp_policy or (
-            "default-src 'self'; "
-            "script-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net; "
-            "style-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net; "
-            "img-src 'self' data: https:; "
-            "connect-src 'self' ws: wss:; "
-            "frame-ancestors 'none'"
-        )
+    def __init__(self, app: ASGIApp, csp_policy: str = None):
+        self.app = app
+        self.csp_policy = csp_policy or DEFAULT_CSP_POLICY
+        self._headers, self._dropped = _security_headers(self.csp_policy)
     
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
-        # Security headers
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        response.headers["Content-Security-Policy"] = self.csp_policy
-        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-        response.headers["Permissions-Policy"] = "geolocation=(), microphone=(), camera=()"
-        
-        # Remove server header
-        if "Server" in response.headers:
-            del response.headers["Server"]
-        
-        return response
+        await self.app(scope, receive, self.wrap_send(send))
+    
+    def wrap_send(self, send: Send) -> Send:
+        """Wrap an ASGI send callable so responses carry the security headers."""
+        return _wrap_send(send, self._headers, self._dropped)
 
 
-class InputSanitizationMiddleware(BaseHTTPMiddleware):
+class InputSanitizationMiddleware:
     """
     Sanitize and validate input data for common attack patterns.
-    """
     
-    SUSPICIOUS_PATTERNS = [
-        # SQL Injection patterns
-        r"(\b(SELECT|INSERT|UPDATE|DELETE|DROP|CREATE|ALTER|EXEC)\b)",
-        r"(\bunion\b.*\bselect\b)",
-        r"(\bor\b.*\b1\s*=\s*1\b)",
-        
-        # XSS patterns
-        r"<script[^>]*>.*?</script>",
-        r"javascript:",
-        r"on\w+\s*=",
-        
-        # Path traversal
-        r"\.\./",
-        r"\.\.\\",
-        
-        # Command injection
-        r"[;&|`$()]",
-        
-        # Template injection
-        r"\{\{.*\}\}",
-        r"\{%.*%\}",
-    ]
+    Pure ASGI middleware working on the raw scope: the path and the decoded
+    query parameters are matched against a single combined regex built from
+    ``SUSPICIOUS_PATTERNS``.
+    """
     
-    def __init__(self, app):
-        super().__init__(app)
-        self.compiled_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in self.SUSPICIOUS_PATTERNS]
+    def __init__(
+        self,
+        app: ASGIApp,
+        skip_prefixes: Tuple[str, ...] = DEFAULT_SKIP_PREFIXES,
+        skip_methods: Tuple[str, ...] = DEFAULT_SKIP_METHODS,
+    ):
+        self.app = app
+        self.skip_methods = frozenset(skip_methods)
+        self._skip_path = _skip_path_pattern(skip_prefixes)
     
-    async def dispatch(self, request: Request, call_next):
-        # Check URL path
-        if self._is_suspicious(request.url.path):
-            logger.warning(f"Suspicious URL path detected: {request.url.path}")
-            return JSONResponse(
-                status_code=400,
-                content={"error": "Invalid request"}
-            )
-        
-        # Check query parameters
-        for param, value in request.query_params.items():
-            if self._is_suspicious(f"{param}={value}"):
-                logger.warning(f"Suspicious query parameter: {param}={value}")
-                return JSONResponse(
-                    status_code=400,
-                    content={"error": "Invalid request parameters"}
-                )
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            rejection = self.check(scope)
+            if rejection is not None:
+                await _send_json_error(send, 400, rejection)
+                return
         
-        return await call_next(request)
+        await self.app(scope, receive, send)
     
-    def _is_suspicious(self, text: str) -> bool:
-        """Check if text contains suspicious patterns."""
-        return any(pattern.search(text) for pattern in self.compiled_patterns)
+    def check(self, scope: Scope) -> Optional[bytes]:
+        """
+        Scan the request path and query string.
+        
+        Returns:
+            Pre-encoded error body if the request is suspicious, None otherwise
+        """
+        return _check_input(scope, self.skip_methods, self._skip_path)
 
 
 class IPWhitelistMiddleware(BaseHTTPMiddleware):
     """
     IP-based access control middleware.
+    
+    Entries may be single addresses or CIDR networks (e.g. "10.0.0.0/8").
     """
     
     def __init__(self, app, allowed_ips: Set[str] = None, admin_ips: Set[str] = None):
         super().__init__(app)
-        self.allowed_ips = allowed_ips or set()
-        self.admin_ips = admin_ips or set()
+        self.allowed_ips = frozenset(allowed_ips or ())
+        self.admin_ips = frozenset(admin_ips or ())
+        
+        # Parsed networks, checked only when the exact-match frozenset misses
+        self._allowed_nets = self._parse_networks(self.allowed_ips)
+        self._admin_nets = self._parse_networks(self.admin_ips)
+        
+        # Nothing to enforce for non-admin paths when no whitelist is configured
+        self._has_whitelist = bool(self.allowed_ips)
     
     async def dispatch(self, request: Request, call_next):
+        path = request.url.path
+        is_admin_path = path.startswith("/admin")
+        
+        # Fast path: no whitelist and not an admin endpoint
+        if not self._has_whitelist and not is_admin_path:
+            return await call_next(request)
+        
         client_ip = self._get_client_ip(request)
         
         # Check if accessing admin endpoints
-        if request.url.path.startswith("/admin"):
-            if client_ip not in self.admin_ips:
+        if is_admin_path:
+            if not self._ip_matches(client_ip, self.admin_ips, self._admin_nets):
                 logger.warning(f"Unauthorized admin access attempt from {client_ip}")
                 return JSONResponse(
                     status_code=403,
@@ -127,7 +291,9 @@ class IPWhitelistMiddleware(BaseHTTPMiddleware):
                 )
         
         # General IP whitelist (if configured)
-        if self.allowed_ips and client_ip not in self.allowed_ips:
+        if self._has_whitelist and not self._ip_matches(
+            client_ip, self.allowed_ips, self._allowed_nets
+        ):
             logger.warning(f"IP not whitelisted: {client_ip}")
             return JSONResponse(
                 status_code=403,
@@ -136,6 +302,30 @@ class IPWhitelistMiddleware(BaseHTTPMiddleware):
         
         return await call_next(request)
     
+    @staticmethod
+    def _parse_networks(entries: frozenset) -> List[ipaddress._BaseNetwork]:
+        """Parse whitelist entries into networks, ignoring invalid ones."""
+        networks = []
+        for entry in entries:
+            try:
+                networks.append(ipaddress.ip_network(entry, strict=False))
+            except ValueError:
+                logger.warning(f"Ignoring invalid IP whitelist entry: {entry}")
+        return networks
+    
+    @staticmethod
+    def _ip_matches(client_ip: str, exact: frozenset, networks: list) -> bool:
+        """Check an IP against exact entries first, then CIDR networks."""
+        if client_ip in exact:
+            return True
+        if not networks:
+            return False
+        try:
+            address = ipaddress.ip_address(client_ip)
+        except ValueError:
+            return False
+        return any(address in network for network in networks)
+    
     def _get_client_ip(self, request: Request) -> str:
         """Get client IP with proxy header support."""
         # Check for forwarded IP headers (be careful with these in production)
@@ -150,24 +340,65 @@ class IPWhitelistMiddleware(BaseHTTPMiddleware):
         return request.client.host if request.client else "unknown"
 
 
-class RequestSizeMiddleware(BaseHTTPMiddleware):
+class RequestSizeMiddleware:
     """
     Limit request body size to prevent DoS attacks.
+    
+    Pure ASGI middleware: the ``content-length`` header is read straight from
+    the raw scope headers and oversized requests are answered with a
+    pre-encoded response, without building a ``Request`` or ``JSONResponse``.
     """
     
-    def __init__(self, app, max_size: int = 10 * 1024 * 1024):  # 10MB default
-        super().__init__(app)
+    def __init__(self, app: ASGIApp, max_size: int = DEFAULT_MAX_SIZE):
+        self.app = app
         self.max_size = max_size
+        self._max_digits = len(str(max_size))
     
-    async def dispatch(self, request: Request, call_next):
-        content_length = request.headers.get("content-length")
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and self.check(scope):
+            await _send_json_error(send, 413, _REQUEST_TOO_LARGE_BODY)
+            return
         
-        if content_length:
-            if int(content_length) > self.max_size:
-                logger.warning(f"Request too large: {content_length} bytes")
-                return JSONResponse(
-                    status_code=413,
-                    content={"error": "Request too large"}
-                )
+        await self.app(scope, receive, send)
+    
+    def check(self, scope: Scope) -> bool:
+        """Return True if the declared content-length exceeds the limit."""
+        return _is_too_large(scope, self.max_size, self._max_digits)
+
+
+class SecurityPipeline:
+    """
+    Fused security middleware chain.
+    
+    Runs the request size check, input sanitization and security header
+    injection in a single ASGI layer instead of stacking
+    ``RequestSizeMiddleware``, ``InputSanitizationMiddleware`` and
+    ``SecurityHeadersMiddleware``: one coroutine and one send wrapper per
+    request. Rejections also carry the security headers.
+    """
+    
+    def __init__(self, app: ASGIApp, max_size: int = DEFAULT_MAX_SIZE, csp_policy: str = None):
+        self.app = app
+        self.max_size = max_size
+        self._max_digits = len(str(max_size))
+        self._headers, self._dropped = _security_headers(csp_policy or DEFAULT_CSP_POLICY)
+        self._skip_methods = frozenset(DEFAULT_SKIP_METHODS)
+        self._skip_path = _skip_path_pattern(DEFAULT_SKIP_PREFIXES)
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        send = _wrap_send(send, self._headers, self._dropped)
+        
+        if _is_too_large(scope, self.max_size, self._max_digits):
+            await _send_json_error(send, 413, _REQUEST_TOO_LARGE_BODY)
+            return
+        
+        rejection = _check_input(scope, self._skip_methods, self._skip_path)
+        if rejection is not None:
+            await _send_json_error(send, 400, rejection)
+            return
         
-        return await call_next(request)
\ No newline at end of file
+        await self.app(scope, receive, send)
@@ -4,8 +4,8 @@ Modern 3D data visualization with integrated ML processing.
 """
 
 import logging
-import asyncio
 import json
+import time
 from contextlib import asynccontextmanager
 from typing import Dict, Any
 
@@ -15,16 +15,14 @@ from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import uvicorn
 
 from core.config import settings
+from core.json import ORJSONResponse
 from core.database import init_database, close_database, check_database_connection
 from core.deps import get_websocket_manager, get_current_user
-from core.security_middleware import (
-    SecurityHeadersMiddleware,
-    InputSanitizationMiddleware,
-    RequestSizeMiddleware
-)
+from core.security_middleware import SecurityPipeline
 from services.websocket import WebSocketManager
 from models.user import User
 
@@ -94,6 +92,7 @@ app = FastAPI(
     description=settings.description,
     debug=settings.debug,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Store WebSocket manager in app state
@@ -124,10 +123,9 @@ if settings.is_production:
         allowed_hosts=trusted_hosts
     )
 
-# Security middlewares (order matters - apply from innermost to outermost)
-app.add_middleware(RequestSizeMiddleware, max_size=settings.max_file_size)
-app.add_middleware(InputSanitizationMiddleware)
-app.add_middleware(SecurityHeadersMiddleware)
+# Security middlewares fused into a single ASGI layer:
+# RequestSizeMiddleware -> InputSanitizationMiddleware -> SecurityHeadersMiddleware
+app.add_middleware(SecurityPipeline, max_size=settings.max_file_size)
 
 
 # Exception handlers
@@ -191,28 +189,63 @@ async def general_exception_handler(request: Request, exc: Exception):
 
 
 # Middleware for request logging
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    """Log HTTP requests."""
-    start_time = asyncio.get_event_loop().time()
-    
-    # Process request
-    response = await call_next(request)
-    
-    # Log request
-    process_time = asyncio.get_event_loop().time() - start_time
+class RequestLoggingMiddleware:
+    """
+    Log HTTP requests.
     
-    if settings.debug or request.url.path.startswith("/api"):
-        logger.info(
-            f"{request.method} {request.url.path} - "
-            f"Status: {response.status_code} - "
-            f"Time: {process_time:.3f}s"
-        )
+    Pure ASGI middleware timed with ``time.perf_counter``. Requests that are
+    neither logged nor timed in a header are passed straight through.
+    """
     
-    # Add process time header
-    response.headers["X-Process-Time"] = str(process_time)
+    def __init__(self, app: ASGIApp, log_all: bool = False, add_process_time: bool = False):
+        self.app = app
+        self.log_all = log_all
+        self.add_process_time = add_process_time
     
-    return response
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        path = scope["path"]
+        should_log = (self.log_all or path.startswith("/api")) and logger.isEnabledFor(logging.INFO)
+        
+        if not should_log and not self.add_process_time:
+            await self.app(scope, receive, send)
+            return
+        
+        start_time = time.perf_counter()
+        status_code = 500
+        
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.add_process_time:
+                    # Add process time header
+                    process_time = time.perf_counter() - start_time
+                    message["headers"] = [
+                        *message.get("headers", ()),
+                        (b"x-process-time", str(process_time).encode("latin-1")),
+                    ]
+            await send(message)
+        
+        await self.app(scope, receive, send_wrapper)
+        
+        if should_log:
+            process_time = time.perf_counter() - start_time
+            logger.info(
+                f"{scope['method']} {path} - "
+                f"Status: {status_code} - "
+                f"Time: {process_time:.3f}s"
+            )
+
+
+app.add_middleware(
+    RequestLoggingMiddleware,
+    log_all=settings.debug,
+    add_process_time=settings.debug,
+)
 
 
 # Health check endpoints
@@ -3,32 +3,40 @@
 Database migration utilities for Data Mirage.
 """
 
-import os
 import sys
 import asyncio
 import argparse
 from pathlib import Path
 
-# Add app directory to Python path
+# The app directory is already sys.path[0] when this file is run as a script.
+# Alembic, SQLAlchemy and the app modules are imported inside the commands
+# that need them so --help and argument errors stay cheap.
 app_dir = Path(__file__).parent
-sys.path.insert(0, str(app_dir))
 
-from alembic.config import Config
-from alembic import command
-from core.config import settings
-from core.database import init_database, close_database, check_database_connection
 
-
-def get_alembic_config():
-    """Get Alembic configuration."""
+def get_alembic_config(connection=None):
+    """
+    Get Alembic configuration.
+    
+    Args:
+        connection: Optional open connection for Alembic to reuse instead
+            of opening its own
+    """
+    from alembic.config import Config
+    from core.config import settings
+    
     alembic_cfg = Config(str(app_dir / "alembic.ini"))
     alembic_cfg.set_main_option("script_location", str(app_dir / "migrations"))
     alembic_cfg.set_main_option("sqlalchemy.url", settings.database_url.replace("+asyncpg", ""))
+    if connection is not None:
+        alembic_cfg.attributes["connection"] = connection
     return alembic_cfg
 
 
 async def check_db_connection():
     """Check database connection."""
+    from core.database import check_database_connection
+    
     print("🔍 Checking database connection...")
     try:
         connected = await check_database_connection()
@@ -43,10 +51,27 @@ async def check_db_connection():
         return False
 
 
+def check_sync_connection(connection) -> bool:
+    """Check database connection on an already open sync connection."""
+    from sqlalchemy import text
+    
+    print("🔍 Checking database connection...")
+    try:
+        if connection.execute(text("SELECT 1")).scalar() == 1:
+            print("✅ Database connection successful")
+            return True
+        print("❌ Database connection failed")
+        return False
+    except Exception as e:
+        print(f"❌ Database connection error: {e}")
+        return False
+
+
 def create_migration(message: str):
     """Create a new migration."""
     print(f"📝 Creating migration: {message}")
     try:
+        from alembic import command
         alembic_cfg = get_alembic_config()
         command.revision(alembic_cfg, message=message, autogenerate=True)
         print("✅ Migration created successfully")
@@ -55,11 +80,12 @@ def create_migration(message: str):
         sys.exit(1)
 
 
-def run_migrations():
-    """Run pending migrations."""
+def run_migrations(connection=None):
+    """Run pending migrations, optionally on an existing connection."""
     print("🔄 Running database migrations...")
     try:
-        alembic_cfg = get_alembic_config()
+        from alembic import command
+        alembic_cfg = get_alembic_config(connection)
         command.upgrade(alembic_cfg, "head")
         print("✅ Migrations completed successfully")
     except Exception as e:
@@ -71,6 +97,7 @@ def rollback_migration(revision: str = "-1"):
     """Rollback to a specific revision."""
     print(f"↩️  Rolling back to revision: {revision}")
     try:
+        from alembic import command
         alembic_cfg = get_alembic_config()
         command.downgrade(alembic_cfg, revision)
         print("✅ Rollback completed successfully")
@@ -83,6 +110,7 @@ def show_migration_history():
     """Show migration history."""
     print("📜 Migration history:")
     try:
+        from alembic import command
         alembic_cfg = get_alembic_config()
         command.history(alembic_cfg, verbose=True)
     except Exception as e:
@@ -94,6 +122,7 @@ def show_current_revision():
     """Show current database revision."""
     print("📍 Current database revision:")
     try:
+        from alembic import command
         alembic_cfg = get_alembic_config()
         command.current(alembic_cfg, verbose=True)
     except Exception as e:
@@ -103,6 +132,8 @@ def show_current_revision():
 
 async def init_db():
     """Initialize database with tables."""
+    from core.database import init_database, close_database
+    
     print("🏗️  Initializing database...")
     try:
         await init_database()
@@ -152,6 +183,8 @@ def main():
         parser.print_help()
         return
     
+    from core.config import settings
+    
     print(f"🗄️  Data Mirage Database Migration Tool")
     print(f"📊 Environment: {settings.environment}")
     print(f"🔗 Database: {settings.database_url.split('@')[-1] if '@' in settings.database_url else 'Not configured'}")
@@ -167,10 +200,19 @@ def main():
         create_migration(args.message)
     
     elif args.command == "migrate":
-        # Check connection first
-        if not asyncio.run(check_db_connection()):
+        from core import database
+        
+        # Check connection first, then migrate on the same warm connection
+        try:
+            connection = database.sync_engine.connect()
+        except Exception as e:
+            print(f"❌ Database connection error: {e}")
             sys.exit(1)
-        run_migrations()
+        
+        with connection, connection.begin():
+            if not check_sync_connection(connection):
+                sys.exit(1)
+            run_migrations(connection)
     
     elif args.command == "rollback":
         rollback_migration(args.revision)
@@ -76,6 +76,12 @@ async def run_migrations_online() -> None:
     In this scenario we need to create an Engine
     and associate a connection with the context.
     """
+    # Reuse a connection handed over by the caller (see migrate.py)
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        do_run_migrations(connection)
+        return
+    
     # Get database URL without async driver
     database_url = settings.database_url.replace("+asyncpg", "")
     
@@ -5,11 +5,26 @@ Defines the database schema for dataset storage and processing.
 
 from datetime import datetime
 from typing import List, Dict, Any, Optional
-from sqlalchemy import Column, DateTime, String, Text, JSON, Integer, ForeignKey, Boolean
-from sqlalchemy.orm import relationship
+
+from sqlalchemy import Column, DateTime, String, Text, Integer, ForeignKey, Boolean, DDL, Index, event, insert, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import deferred, relationship
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.sql import func
 
-from core.database import Base
+from core.database import Base, JSONBType, UUIDType, uuid7
+from core.json import dumps
+
+
+def _looks_numeric(value: Any) -> bool:
+    """Check whether a value converts to float, without raising for plain numbers."""
+    if isinstance(value, (int, float)):
+        return True
+    try:
+        float(value)
+        return True
+    except (ValueError, TypeError):
+        return False
 
 
 class Dataset(Base):
@@ -22,6 +37,9 @@ class Dataset(Base):
         description: Optional dataset description
         original_data: Raw uploaded data as JSON
         processed_data: Processed data after ML operations
+        row_count_cached: Cached number of rows in original_data
+        column_count_cached: Cached number of columns in original_data
+        columns_cached: Cached column names of original_data
         metadata: Dataset metadata (columns, row count, etc.)
         file_info: Information about the original file
         processing_config: Last ML processing configuration used
@@ -47,38 +65,44 @@ class Dataset(Base):
     __tablename__ = "datasets"
     
     # Primary key
-    id: str = Column(String, primary_key=True, index=True)
+    id: str = Column(UUIDType, primary_key=True, index=True, default=uuid7)
     
     # Basic information
     name: str = Column(String, nullable=False, index=True)
     description: Optional[str] = Column(Text, nullable=True)
     
     # Data storage
-    original_data: List[Dict[str, Any]] = Column(JSON, nullable=False)
-    processed_data: Optional[List[Dict[str, Any]]] = Column(JSON, nullable=True)
+    # Deferred so listing queries never fetch the blob; use undefer() when rows are needed
+    original_data = deferred(Column(JSONBType, nullable=False))  # List[Dict[str, Any]]
+    processed_data: Optional[List[Dict[str, Any]]] = Column(JSONBType, nullable=True)
+    
+    # Shape of original_data, cached by update_metadata
+    row_count_cached: Optional[int] = Column(Integer, nullable=True)
+    column_count_cached: Optional[int] = Column(Integer, nullable=True)
+    columns_cached: Optional[List[str]] = Column(JSONBType, nullable=True)
     
     # Metadata and file information  
-    dataset_metadata: Dict[str, Any] = Column(JSON, nullable=False, default=lambda: {})
-    file_info: Dict[str, Any] = Column(JSON, nullable=False, default=lambda: {})
+    dataset_metadata: Dict[str, Any] = Column(JSONBType, nullable=False, server_default=text("'{}'"))
+    file_info: Dict[str, Any] = Column(JSONBType, nullable=False, server_default=text("'{}'"))
     
     # Processing information
-    processing_config: Optional[Dict[str, Any]] = Column(JSON, nullable=True)
-    processing_results: Optional[Dict[str, Any]] = Column(JSON, nullable=True)
+    processing_config: Optional[Dict[str, Any]] = Column(JSONBType, nullable=True)
+    processing_results: Optional[Dict[str, Any]] = Column(JSONBType, nullable=True)
     
     # Status tracking
     status: str = Column(String, default="uploaded", nullable=False, index=True)
     error_message: Optional[str] = Column(Text, nullable=True)
     
     # Ownership and access
-    user_id: str = Column(String, ForeignKey("users.id"), nullable=False, index=True)
+    user_id: str = Column(UUIDType, ForeignKey("users.id"), nullable=False, index=True)
     is_public: bool = Column(Boolean, default=False, nullable=False)
     
     # Organization
-    tags: Optional[List[str]] = Column(JSON, nullable=True)
+    tags: Optional[List[str]] = Column(JSONBType, nullable=True)
     
     # Versioning
     version: int = Column(Integer, default=1, nullable=False)
-    parent_id: Optional[str] = Column(String, ForeignKey("datasets.id"), nullable=True, index=True)
+    parent_id: Optional[str] = Column(UUIDType, ForeignKey("datasets.id"), nullable=True, index=True)
     
     # Timestamps
     created_at: datetime = Column(
@@ -96,13 +120,15 @@ class Dataset(Base):
     processed_at: Optional[datetime] = Column(DateTime, nullable=True)
     
     # Relationships
-    user = relationship("User", back_populates="datasets")
+    # Relationships use lazy="raise": callers opt in with selectinload() so
+    # loops over datasets can't silently issue one query per row
+    user = relationship("User", back_populates="datasets", lazy="raise")
     
     visualizations = relationship(
         "Visualization",
         back_populates="dataset",
         cascade="all, delete-orphan",
-        lazy="select"
+        lazy="raise"
     )
     
     # Self-referential relationship for versioning
@@ -114,6 +140,29 @@ class Dataset(Base):
         single_parent=True
     )
     
+    # Fetch server-generated updated_at via RETURNING on UPDATE as well, so
+    # endpoints can serialize the row right after commit
+    __mapper_args__ = {"eager_defaults": True}
+    
+    __table_args__ = (
+        # Containment lookups on metadata (columns, types) on PostgreSQL
+        Index(
+            "ix_datasets_dataset_metadata_gin",
+            "dataset_metadata",
+            postgresql_using="gin",
+            postgresql_ops={"dataset_metadata": "jsonb_path_ops"},
+        ).ddl_if(dialect="postgresql"),
+        # "My datasets" listings filter by owner and status, newest first;
+        # INCLUDE lets the name/version projection skip the heap
+        Index(
+            "ix_datasets_user_status_created",
+            user_id,
+            status,
+            created_at.desc(),
+            postgresql_include=["name", "version"],
+        ),
+    )
+    
     def __repr__(self) -> str:
         """String representation of dataset."""
         return f"<Dataset(id='{self.id}', name='{self.name}', status='{self.status}')>"
@@ -121,21 +170,42 @@ class Dataset(Base):
     @property
     def row_count(self) -> int:
         """Get number of rows in the dataset."""
-        return len(self.original_data) if self.original_data else 0
+        if self.row_count_cached is not None:
+            return self.row_count_cached
+        
+        data = self._loaded_data()
+        if data is None:
+            return (self.dataset_metadata or {}).get("row_count", 0)
+        return len(data) if data else 0
     
     @property
     def column_count(self) -> int:
         """Get number of columns in the dataset."""
-        if not self.original_data or not self.original_data[0]:
-            return 0
-        return len(self.original_data[0].keys())
+        if self.column_count_cached is not None:
+            return self.column_count_cached
+        return len(self.columns)
     
     @property
     def columns(self) -> List[str]:
         """Get list of column names."""
-        if not self.original_data or not self.original_data[0]:
+        if self.columns_cached is not None:
+            return self.columns_cached
+        
+        data = self._loaded_data()
+        if data is None:
+            return (self.dataset_metadata or {}).get("columns", [])
+        if not data or not data[0]:
             return []
-        return list(self.original_data[0].keys())
+        return list(data[0].keys())
+    
+    def _loaded_data(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get original_data only if it is already loaded.
+        
+        Returns None for an unloaded deferred column so that property access
+        never triggers a lazy load (which async sessions cannot perform).
+        """
+        return self.__dict__.get("original_data")
     
     @property
     def size_mb(self) -> float:
@@ -159,39 +229,98 @@ class Dataset(Base):
         """Check if dataset processing failed."""
         return self.status == "error"
     
-    def update_metadata(self) -> None:
-        """Update metadata based on current data."""
-        if not self.original_data:
-            return
-        
-        # Initialize metadata if it's None (defensive programming)
-        if self.dataset_metadata is None:
-            self.dataset_metadata = {}
+    @staticmethod
+    def _compute_metadata(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Derive shape and column types from dataset rows.
         
-        sample_data = self.original_data[0] if self.original_data else {}
+        Args:
+            rows: Non-empty list of data rows
+            
+        Returns:
+            Metadata dictionary (row_count, column_count, columns, column_types)
+        """
+        sample_data = rows[0]
+        sample_rows = rows[:100]
         
         # Analyze column types
         column_types = {}
         for column in sample_data.keys():
-            values = [row.get(column) for row in self.original_data[:100] if row.get(column) is not None]
+            values = [value for value in (row.get(column) for row in sample_rows) if value is not None]
             if not values:
                 column_types[column] = "unknown"
                 continue
             
-            # Check if all values are numeric
-            try:
-                [float(v) for v in values]
+            # all() stops at the first non-numeric value
+            if all(_looks_numeric(value) for value in values):
                 column_types[column] = "numeric"
-            except (ValueError, TypeError):
+            else:
                 column_types[column] = "categorical"
         
-        self.dataset_metadata.update({
-            "row_count": self.row_count,
-            "column_count": self.column_count,
-            "columns": self.columns,
+        columns = list(sample_data.keys())
+        return {
+            "row_count": len(rows),
+            "column_count": len(columns),
+            "columns": columns,
             "column_types": column_types,
             "updated_at": datetime.utcnow().isoformat(),
-        })
+        }
+    
+    def update_metadata(self) -> None:
+        """Update metadata based on current data."""
+        if not self.original_data:
+            return
+        
+        # Initialize metadata if it's None (defensive programming)
+        if self.dataset_metadata is None:
+            self.dataset_metadata = {}
+        
+        metadata = self._compute_metadata(self.original_data)
+        
+        # Cache the shape as real columns
+        self.row_count_cached = metadata["row_count"]
+        self.columns_cached = metadata["columns"]
+        self.column_count_cached = metadata["column_count"]
+        
+        self.dataset_metadata.update(metadata)
+    
+    # Columns written by update_metadata
+    _METADATA_FIELDS = (
+        "dataset_metadata",
+        "row_count_cached",
+        "column_count_cached",
+        "columns_cached",
+    )
+    
+    @classmethod
+    async def bulk_update_metadata(cls, session: AsyncSession, datasets: List["Dataset"]) -> None:
+        """
+        Refresh and persist metadata for many datasets in one statement.
+        
+        Metadata is computed in Python for each dataset, then written with a
+        single executemany UPDATE keyed on the primary key instead of one
+        flush per dataset. The instances are marked as in sync with the
+        database so no flush writes them again.
+        
+        Args:
+            session: Database session
+            datasets: Persistent datasets with original_data loaded
+        """
+        if not datasets:
+            return
+        
+        rows = []
+        for dataset in datasets:
+            dataset.update_metadata()
+            row = {"id": dataset.id}
+            for field in cls._METADATA_FIELDS:
+                row[field] = getattr(dataset, field)
+                # Clear pending history so autoflush doesn't issue a
+                # per-row UPDATE ahead of the batched one
+                set_committed_value(dataset, field, row[field])
+            rows.append(row)
+        
+        await session.execute(update(cls), rows)
     
     def set_processing(self) -> None:
         """Set dataset status to processing."""
@@ -221,41 +350,102 @@ class Dataset(Base):
         self.error_message = error_message
         self.processing_results = None
     
-    def create_version(self, new_data: List[Dict[str, Any]], description: str = None) -> "Dataset":
+    def _version_values(self, new_data: List[Dict[str, Any]], description: Optional[str]) -> Dict[str, Any]:
         """
-        Create a new version of this dataset.
+        Build column values for a new version of this dataset.
         
         Args:
             new_data: New dataset data
             description: Optional description for the new version
             
         Returns:
-            New dataset version
+            Column values keyed by attribute name
         """
-        import uuid
-        
-        new_dataset = Dataset(
-            id=str(uuid.uuid4()),
-            name=f"{self.name} v{self.version + 1}",
-            description=description or f"Version {self.version + 1} of {self.name}",
-            original_data=new_data,
-            user_id=self.user_id,
-            parent_id=self.id,
-            version=self.version + 1,
-            is_public=self.is_public,
-            tags=self.tags.copy() if self.tags else None,
-            dataset_metadata={},  # Initialize empty metadata dictionary
-            file_info={
+        return {
+            "id": uuid7(),
+            "name": f"{self.name} v{self.version + 1}",
+            "description": description or f"Version {self.version + 1} of {self.name}",
+            "original_data": new_data,
+            "user_id": self.user_id,
+            "parent_id": self.id,
+            "version": self.version + 1,
+            "is_public": self.is_public,
+            "tags": self.tags.copy() if self.tags else None,
+            "dataset_metadata": {},  # Initialize empty metadata dictionary
+            "file_info": {
                 "filename": f"{self.name}_v{self.version + 1}",
-                "size": len(str(new_data).encode('utf-8')),
+                "size": self._estimate_json_size(new_data),
                 "mime_type": "application/json",
                 "created_from_version": self.version,
-            }
-        )
+            },
+        }
+    
+    def create_version(self, new_data: List[Dict[str, Any]], description: str = None) -> "Dataset":
+        """
+        Create a new version of this dataset.
         
+        Args:
+            new_data: New dataset data
+            description: Optional description for the new version
+            
+        Returns:
+            New dataset version
+        """
+        new_dataset = Dataset(**self._version_values(new_data, description))
         new_dataset.update_metadata()
         return new_dataset
     
+    async def insert_version(
+        self,
+        session: AsyncSession,
+        new_data: List[Dict[str, Any]],
+        description: Optional[str] = None,
+    ) -> str:
+        """
+        Insert a new version of this dataset with a single Core INSERT.
+        
+        Unlike create_version, no ORM object is built or tracked: the rows
+        are passed straight through as a bound parameter.
+        
+        Args:
+            session: Database session
+            new_data: New dataset data
+            description: Optional description for the new version
+            
+        Returns:
+            ID of the new dataset version
+        """
+        values = self._version_values(new_data, description)
+        if new_data:
+            metadata = self._compute_metadata(new_data)
+            values.update({
+                "dataset_metadata": metadata,
+                "row_count_cached": metadata["row_count"],
+                "column_count_cached": metadata["column_count"],
+                "columns_cached": metadata["columns"],
+            })
+        
+        await session.execute(insert(Dataset).values(**values))
+        return values["id"]
+    
+    @staticmethod
+    def _estimate_json_size(rows: List[Dict[str, Any]], sample_size: int = 100) -> int:
+        """
+        Estimate the serialized JSON size of a list of rows in bytes.
+        
+        Serializes at most ``sample_size`` rows with the shared encoder and
+        scales by the total row count, so large datasets are never fully
+        materialized.
+        """
+        if not rows:
+            return 0
+        
+        sample = rows[:sample_size]
+        sample_bytes = len(dumps(sample))
+        if len(sample) == len(rows):
+            return sample_bytes
+        return sample_bytes * len(rows) // len(sample)
+    
     def get_sample_data(self, n: int = 5) -> List[Dict[str, Any]]:
         """
         Get sample rows from the dataset.
@@ -283,35 +473,58 @@ class Dataset(Base):
         if not self.original_data or column not in self.columns:
             return {}
         
-        values = [row.get(column) for row in self.original_data if row.get(column) is not None]
+        import math
+        import statistics
+        from collections import Counter
+        
+        from services.stats_kernels import column_moments
+        
+        # Single pass over rows: value counts, null count and numeric values
+        value_counts = Counter()
+        numeric_values = []
+        null_count = 0
+        is_numeric = True
+        
+        for row in self.original_data:
+            value = row.get(column)
+            if value is None:
+                null_count += 1
+                continue
+            
+            value_counts[value] += 1
+            
+            if is_numeric:
+                try:
+                    number = float(value)
+                except (ValueError, TypeError):
+                    is_numeric = False
+                    numeric_values = []
+                    continue
+                
+                numeric_values.append(number)
         
-        if not values:
+        count = len(self.original_data) - null_count
+        if not count:
             return {"count": 0, "null_count": len(self.original_data)}
         
         stats = {
-            "count": len(values),
-            "null_count": len(self.original_data) - len(values),
-            "unique_count": len(set(values)),
+            "count": count,
+            "null_count": null_count,
+            "unique_count": len(value_counts),
         }
         
-        # Try to get numeric statistics
-        try:
-            numeric_values = [float(v) for v in values]
-            import statistics
-            
+        if is_numeric:
+            _, mean, m2, minimum, maximum = column_moments(numeric_values)
             stats.update({
                 "type": "numeric",
-                "min": min(numeric_values),
-                "max": max(numeric_values),
-                "mean": statistics.mean(numeric_values),
+                "min": minimum,
+                "max": maximum,
+                "mean": mean,
                 "median": statistics.median(numeric_values),
-                "std": statistics.stdev(numeric_values) if len(numeric_values) > 1 else 0,
+                "std": math.sqrt(m2 / (count - 1)) if count > 1 else 0,
             })
-        except (ValueError, TypeError):
+        else:
             # Categorical data
-            from collections import Counter
-            value_counts = Counter(values)
-            
             stats.update({
                 "type": "categorical",
                 "most_common": value_counts.most_common(5),
@@ -323,6 +536,10 @@ class Dataset(Base):
         """
         Convert dataset to dictionary.
         
+        The keys mirror schemas.dataset.DatasetResponse (plus DatasetWithData
+        fields with include_data). Rows were validated on the way in, so read
+        endpoints serialize this dict directly instead of re-validating it.
+        
         Args:
             include_data: Whether to include the actual data
             
@@ -360,4 +577,17 @@ class Dataset(Base):
                 "processing_results": self.processing_results,
             })
         
-        return data
\ No newline at end of file
+        return data
+
+
+# Large data payloads are stored out-of-line and uncompressed on PostgreSQL,
+# so TOAST slices can be read without decompressing the whole value
+event.listen(
+    Dataset.__table__,
+    "after_create",
+    DDL(
+        "ALTER TABLE datasets "
+        "ALTER COLUMN original_data SET STORAGE EXTERNAL, "
+        "ALTER COLUMN processed_data SET STORAGE EXTERNAL"
+    ).execute_if(dialect="postgresql"),
+)
@@ -3,13 +3,19 @@ Session model for SQLAlchemy ORM.
 Defines the database schema for user session management.
 """
 
-from datetime import datetime
-from typing import Dict, Any, Optional, List
-from sqlalchemy import Column, DateTime, String, JSON, ForeignKey, Boolean, Text, Integer
-from sqlalchemy.orm import relationship
+import hashlib
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Dict, Any, Iterable, Optional, List
+from sqlalchemy import Column, DateTime, String, JSON, ForeignKey, Boolean, Text, Integer, Index, LargeBinary, bindparam, event, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import reconstructor, relationship, validates
+from sqlalchemy.orm.attributes import flag_modified
 from sqlalchemy.sql import func
 
-from core.database import Base
+from core.database import Base, JSONBType, UUIDType, utcnow, uuid7
+
+if TYPE_CHECKING:
+    import numpy as np
 
 
 class Session(Base):
@@ -19,7 +25,7 @@ class Session(Base):
     Attributes:
         id: Primary key (session ID)
         user_id: Foreign key to user
-        refresh_token: Hashed refresh token
+        refresh_token_hash: Truncated SHA-256 digest of the refresh token
         device_info: Information about the user's device
         ip_address: IP address from which session was created
         user_agent: Browser/client user agent
@@ -36,13 +42,13 @@ class Session(Base):
     __tablename__ = "sessions"
     
     # Primary key
-    id: str = Column(String, primary_key=True, index=True)
+    id: str = Column(UUIDType, primary_key=True, index=True, default=uuid7)
     
     # User relationship
-    user_id: str = Column(String, ForeignKey("users.id"), nullable=False, index=True)
+    user_id: str = Column(UUIDType, ForeignKey("users.id"), nullable=False, index=True)
     
-    # Token information
-    refresh_token: str = Column(String, nullable=False, unique=True, index=True)
+    # Token information (only a 16-byte digest is stored; see hash_token)
+    refresh_token_hash: bytes = Column(LargeBinary(16), nullable=False, unique=True, index=True)
     
     # Device and location tracking
     device_info: Optional[Dict[str, Any]] = Column(JSON, nullable=True)
@@ -62,12 +68,46 @@ class Session(Base):
     session_data: Optional[Dict[str, Any]] = Column(JSON, nullable=True)
     
     # Relationships
-    user = relationship("User", back_populates="sessions")
+    user = relationship("User", back_populates="sessions", lazy="raise")
+    
+    __table_args__ = (
+        # Partial index over live sessions only, so the expiry sweep in
+        # cleanup_expired_bulk scans O(active) rows rather than the whole table
+        Index(
+            "ix_sessions_active_expires_at",
+            "expires_at",
+            postgresql_where=text("is_active"),
+            sqlite_where=text("is_active"),
+        ),
+        # Live sessions per user (logout-all, session listings)
+        Index(
+            "ix_sessions_user_active",
+            "user_id",
+            postgresql_where=text("is_active"),
+            sqlite_where=text("is_active"),
+        ),
+    )
     
     def __repr__(self) -> str:
         """String representation of session."""
         return f"<Session(id='{self.id}', user_id='{self.user_id}', active='{self.is_active}')>"
     
+    @staticmethod
+    def hash_token(token: str) -> bytes:
+        """
+        Digest a refresh token for storage and lookup.
+        
+        128 bits of SHA-256 keep collisions negligible while making the
+        unique index a fraction of the size of one over the raw token.
+        
+        Args:
+            token: Refresh token as issued to the client
+            
+        Returns:
+            First 16 bytes of the token's SHA-256 digest
+        """
+        return hashlib.sha256(token.encode()).digest()[:16]
+    
     @property
     def is_expired(self) -> bool:
         """Check if session has expired."""
@@ -100,22 +140,29 @@ class Session(Base):
     
     def update_last_used(self) -> None:
         """Update last used timestamp."""
-        self.last_used = func.now()
+        self.last_used = utcnow()
     
     def revoke(self) -> None:
         """Revoke the session."""
         self.is_active = False
-        self.revoked_at = func.now()
+        self.revoked_at = utcnow()
     
-    def extend_expiry(self, days: int = 7) -> None:
+    @classmethod
+    async def extend_expiry(cls, session: AsyncSession, session_id: str, days: int = 7) -> None:
         """
-        Extend session expiry.
+        Extend session expiry to the given number of days from the database's now.
         
         Args:
+            session: Database session
+            session_id: ID of session to extend
             days: Number of days to extend
         """
-        from datetime import timedelta
-        self.expires_at = datetime.utcnow() + timedelta(days=days)
+        await session.execute(
+            update(cls)
+            .where(cls.id == session_id)
+            .values(expires_at=utcnow(timedelta(days=days)))
+            .execution_options(synchronize_session=False)
+        )
     
     def is_from_same_device(self, other_session: "Session") -> bool:
         """
@@ -139,10 +186,46 @@ class Session(Base):
         )
     
     def cleanup_expired(self) -> None:
-        """Mark expired sessions as inactive."""
+        """Mark this session as inactive if it has expired."""
         if self.is_expired and self.is_active:
             self.is_active = False
-            self.revoked_at = func.now()
+            self.revoked_at = utcnow()
+    
+    @classmethod
+    async def cleanup_expired_bulk(
+        cls,
+        session: AsyncSession,
+        limit: Optional[int] = None,
+    ) -> int:
+        """
+        Mark expired active sessions as inactive in one UPDATE.
+        
+        Args:
+            session: Database session
+            limit: Maximum number of sessions to deactivate (all if None).
+                Bounded batches keep row locks and WAL per statement small;
+                on PostgreSQL rows locked by a concurrent sweep are skipped.
+            
+        Returns:
+            Number of sessions deactivated
+        """
+        expired = (cls.is_active == True, cls.expires_at < utcnow())
+        stmt = update(cls).values(is_active=False, revoked_at=utcnow())
+        if limit is None:
+            stmt = stmt.where(*expired)
+        else:
+            batch = (
+                select(cls.id)
+                .where(*expired)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )
+            stmt = stmt.where(cls.id.in_(batch.scalar_subquery()))
+        
+        result = await session.execute(
+            stmt.execution_options(synchronize_session=False)
+        )
+        return result.rowcount
     
     def to_dict(self, include_sensitive: bool = False) -> Dict[str, Any]:
         """
@@ -170,7 +253,7 @@ class Session(Base):
         
         if include_sensitive:
             data.update({
-                "refresh_token": self.refresh_token,
+                "refresh_token_hash": self.refresh_token_hash.hex(),
                 "device_info": self.device_info,
                 "user_agent": self.user_agent,
                 "session_data": self.session_data,
@@ -206,11 +289,11 @@ class Visualization(Base):
     __tablename__ = "visualizations"
     
     # Primary key
-    id: str = Column(String, primary_key=True, index=True)
+    id: str = Column(UUIDType, primary_key=True, index=True, default=uuid7)
     
     # Relationships
-    dataset_id: str = Column(String, ForeignKey("datasets.id"), nullable=False, index=True)
-    user_id: str = Column(String, ForeignKey("users.id"), nullable=False, index=True)
+    dataset_id: str = Column(UUIDType, ForeignKey("datasets.id"), nullable=False, index=True)
+    user_id: str = Column(UUIDType, ForeignKey("users.id"), nullable=False, index=True)
     
     # Basic information
     name: str = Column(String, nullable=False)
@@ -227,16 +310,26 @@ class Visualization(Base):
     is_public: bool = Column(Boolean, default=False, nullable=False)
     
     # Engagement metrics
-    view_count: int = Column(Integer, default=0, nullable=False)
-    liked_by: Optional[List[str]] = Column(JSON, nullable=True)
+    view_count: int = Column(Integer, server_default=text("0"), nullable=False)
+    liked_by: List[str] = Column(JSONBType, nullable=False, server_default=text("'[]'"))
     
     # Timestamps
     created_at: datetime = Column(DateTime, default=func.now(), nullable=False, index=True)
     updated_at: datetime = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
     
     # Relationships
-    dataset = relationship("Dataset", back_populates="visualizations")
-    user = relationship("User")
+    dataset = relationship("Dataset", back_populates="visualizations", lazy="raise")
+    user = relationship("User", lazy="raise")
+    
+    __table_args__ = (
+        # Serves the liked_by containment checks in add_like/is_liked_by
+        Index(
+            "ix_visualizations_liked_by_gin",
+            "liked_by",
+            postgresql_using="gin",
+            postgresql_ops={"liked_by": "jsonb_path_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
     
     def __repr__(self) -> str:
         """String representation of visualization."""
@@ -247,44 +340,184 @@ class Visualization(Base):
         """Get number of likes."""
         return len(self.liked_by) if self.liked_by else 0
     
-    def increment_view_count(self) -> None:
-        """Increment view count."""
-        self.view_count += 1
+    @classmethod
+    async def increment_view_count(cls, session: AsyncSession, visualization_id: str) -> None:
+        """
+        Atomically increment the view count of one visualization.
+        
+        Args:
+            session: Database session
+            visualization_id: ID of viewed visualization
+        """
+        await session.execute(
+            update(cls)
+            .where(cls.id == visualization_id)
+            .values(view_count=cls.view_count + 1)
+            .execution_options(synchronize_session=False)
+        )
+    
+    @classmethod
+    async def increment_view_counts(cls, session: AsyncSession, visualization_ids: List[str]) -> None:
+        """
+        Increment view counts for many visualizations in one UPDATE.
+        
+        Args:
+            session: Database session
+            visualization_ids: IDs of viewed visualizations
+        """
+        if not visualization_ids:
+            return
+        
+        await session.execute(
+            update(cls)
+            .where(cls.id.in_(visualization_ids))
+            .values(view_count=cls.view_count + 1)
+            .execution_options(synchronize_session=False)
+        )
     
-    def add_like(self, user_id: str) -> None:
+    # Like mutations run inside PostgreSQL so the liked_by array is never
+    # round-tripped through Python
+    _ADD_LIKE_SQL = text(
+        "UPDATE visualizations "
+        "SET liked_by = COALESCE(liked_by, '[]'::jsonb) || to_jsonb(CAST(:user_id AS text)) "
+        "WHERE id = :visualization_id "
+        "AND NOT COALESCE(liked_by, '[]'::jsonb) @> to_jsonb(CAST(:user_id AS text))"
+    ).bindparams(bindparam("visualization_id", type_=UUIDType))
+    _REMOVE_LIKE_SQL = text(
+        "UPDATE visualizations "
+        "SET liked_by = liked_by - CAST(:user_id AS text) "
+        "WHERE id = :visualization_id "
+        "AND liked_by @> to_jsonb(CAST(:user_id AS text))"
+    ).bindparams(bindparam("visualization_id", type_=UUIDType))
+    _IS_LIKED_BY_SQL = text(
+        "SELECT COALESCE(liked_by @> to_jsonb(CAST(:user_id AS text)), false) "
+        "FROM visualizations WHERE id = :visualization_id"
+    ).bindparams(bindparam("visualization_id", type_=UUIDType))
+    
+    @classmethod
+    async def add_like(cls, session: AsyncSession, visualization_id: str, user_id: str) -> bool:
         """
         Add a like from a user.
         
         Args:
+            session: Database session
+            visualization_id: ID of the liked visualization
             user_id: ID of user who liked the visualization
+            
+        Returns:
+            True if the like was added, False if it already existed
         """
-        if not self.liked_by:
-            self.liked_by = []
-        
-        if user_id not in self.liked_by:
-            self.liked_by.append(user_id)
+        result = await session.execute(
+            cls._ADD_LIKE_SQL,
+            {"user_id": user_id, "visualization_id": visualization_id},
+        )
+        return result.rowcount > 0
     
-    def remove_like(self, user_id: str) -> None:
+    @classmethod
+    async def remove_like(cls, session: AsyncSession, visualization_id: str, user_id: str) -> bool:
         """
         Remove a like from a user.
         
         Args:
+            session: Database session
+            visualization_id: ID of the unliked visualization
             user_id: ID of user who unliked the visualization
+            
+        Returns:
+            True if the like was removed, False if there was none
         """
-        if self.liked_by and user_id in self.liked_by:
-            self.liked_by.remove(user_id)
+        result = await session.execute(
+            cls._REMOVE_LIKE_SQL,
+            {"user_id": user_id, "visualization_id": visualization_id},
+        )
+        return result.rowcount > 0
+    
+    @reconstructor
+    def _init_liked_set(self) -> None:
+        """Build the liked_by lookup set once when the row is loaded."""
+        liked_by = self.__dict__.get("liked_by")
+        self._liked_set = set(liked_by) if liked_by is not None else None
     
-    def is_liked_by(self, user_id: str) -> bool:
+    @validates("liked_by")
+    def _reset_liked_set(self, key: str, liked_by: List[str]) -> List[str]:
+        """Drop the lookup set whenever liked_by is reassigned."""
+        self._liked_set = None
+        return liked_by
+    
+    def merge_likes(self, user_ids: Iterable[str]) -> int:
+        """
+        Add likes in memory, e.g. when replaying likes inside a transaction.
+        
+        Membership is checked against ``_liked_set``, built when the row is
+        loaded and kept in step by each merge, so merging N likes costs O(N)
+        rather than O(N * M). Reassigning, expiring or refreshing liked_by
+        drops the set and the next merge rebuilds it.
+        
+        Args:
+            user_ids: IDs of users who liked the visualization
+            
+        Returns:
+            Number of likes actually added
+        """
+        liked_by = self.liked_by if self.liked_by is not None else []
+        seen = getattr(self, "_liked_set", None)
+        if seen is None:
+            seen = set(liked_by)
+        
+        added = 0
+        for user_id in user_ids:
+            if user_id not in seen:
+                seen.add(user_id)
+                liked_by.append(user_id)
+                added += 1
+        
+        if added:
+            self.liked_by = liked_by
+            # In-place append isn't tracked on a plain JSON column
+            flag_modified(self, "liked_by")
+        self._liked_set = seen
+        return added
+    
+    @classmethod
+    async def is_liked_by(cls, session: AsyncSession, visualization_id: str, user_id: str) -> bool:
         """
         Check if visualization is liked by a specific user.
         
         Args:
+            session: Database session
+            visualization_id: ID of visualization to check
             user_id: ID of user to check
             
         Returns:
             True if user has liked this visualization
         """
-        return bool(self.liked_by and user_id in self.liked_by)
+        result = await session.execute(
+            cls._IS_LIKED_BY_SQL,
+            {"user_id": user_id, "visualization_id": visualization_id},
+        )
+        return bool(result.scalar())
+    
+    def point_positions(self) -> "np.ndarray":
+        """
+        Get the 3D positions of all result points as one float32 array.
+        
+        Points are stored as ProcessingResult dicts; flattening their
+        position triples straight into a typed buffer avoids holding a boxed
+        tuple of Python floats per point in rendering and analysis code.
+        
+        Returns:
+            Array of shape (n_points, 3), empty when there are no points
+        """
+        import numpy as np
+        from itertools import chain
+        
+        points = (self.results or {}).get("points") or []
+        flat = np.fromiter(
+            chain.from_iterable(point["position"] for point in points),
+            dtype=np.float32,
+            count=3 * len(points),
+        )
+        return flat.reshape(-1, 3)
     
     def to_dict(self, include_results: bool = True) -> Dict[str, Any]:
         """
@@ -314,4 +547,20 @@ class Visualization(Base):
         if include_results:
             data["results"] = self.results
         
-        return data
\ No newline at end of file
+        return data
+
+
+def _reload_liked_set(target: Visualization, context, attrs: Optional[Iterable[str]]) -> None:
+    """Rebuild the like lookup set after liked_by is refreshed from the row."""
+    if attrs is None or "liked_by" in attrs:
+        target._init_liked_set()
+
+
+def _expire_liked_set(target: Visualization, attrs: Optional[Iterable[str]]) -> None:
+    """Drop the like lookup set when liked_by is expired."""
+    if attrs is None or "liked_by" in attrs:
+        target._liked_set = None
+
+
+event.listen(Visualization, "refresh", _reload_liked_set)
+event.listen(Visualization, "expire", _expire_liked_set)
@@ -4,12 +4,18 @@ Defines the database schema and relationships for user management.
 """
 
 from datetime import datetime
-from typing import List, Optional
-from sqlalchemy import Boolean, Column, DateTime, String, Text, Integer
-from sqlalchemy.orm import relationship
+from typing import List, Optional, Tuple
+from sqlalchemy import Boolean, Column, DateTime, String, Text, Index, Integer, case, or_, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import deferred, relationship, validates
 from sqlalchemy.sql import func
 
-from core.database import Base
+from core.database import Base, UUIDType, uuid7
+
+
+def _email_local_default(context) -> str:
+    """Derive email_local for inserts that bypass the ORM validator."""
+    return context.get_current_parameters()["email"].partition("@")[0]
 
 
 class User(Base):
@@ -19,6 +25,7 @@ class User(Base):
     Attributes:
         id: Primary key UUID
         email: Unique email address
+        email_local: Local part of email (before "@"), kept in sync with email
         hashed_password: Bcrypt hashed password
         first_name: User's first name
         last_name: User's last name
@@ -39,16 +46,20 @@ class User(Base):
     __tablename__ = "users"
     
     # Primary key
-    id: str = Column(String, primary_key=True, index=True)
+    id: str = Column(UUIDType, primary_key=True, index=True, default=uuid7)
     
     # Authentication fields
     email: str = Column(String, unique=True, index=True, nullable=False)
+    email_local: str = Column(String, nullable=False, default=_email_local_default)
     hashed_password: str = Column(String, nullable=False)
     
     # Profile fields
     first_name: Optional[str] = Column(String, nullable=True)
     last_name: Optional[str] = Column(String, nullable=True)
-    profile_image_url: Optional[str] = Column(Text, nullable=True)
+    # Deferred: may hold a large data URL that listing queries should not fetch.
+    # raiseload: reading it unloaded is an error rather than a hidden SELECT,
+    # so queries must undefer() it explicitly
+    profile_image_url = deferred(Column(Text, nullable=True), raiseload=True)
     
     # Account status
     is_active: bool = Column(Boolean, default=True, nullable=False)
@@ -81,63 +92,158 @@ class User(Base):
         nullable=False
     )
     
-    # Relationships
+    # Relationships (lazy="raise": opt in with selectinload() at the query)
     datasets = relationship(
         "Dataset",
         back_populates="user",
         cascade="all, delete-orphan",
-        lazy="select"
+        lazy="raise"
     )
     
     sessions = relationship(
         "Session",
         back_populates="user",
         cascade="all, delete-orphan",
-        lazy="select"
+        lazy="raise"
+    )
+    
+    __table_args__ = (
+        # Tokens are looked up by equality and are NULL for most users, so
+        # partial indexes stay small
+        Index(
+            "ix_users_reset_token",
+            "reset_token",
+            postgresql_where=text("reset_token IS NOT NULL"),
+            sqlite_where=text("reset_token IS NOT NULL"),
+        ),
+        Index(
+            "ix_users_verification_token",
+            "verification_token",
+            postgresql_where=text("verification_token IS NOT NULL"),
+            sqlite_where=text("verification_token IS NOT NULL"),
+        ),
     )
     
     def __repr__(self) -> str:
         """String representation of user."""
         return f"<User(id='{self.id}', email='{self.email}')>"
     
+    @validates("email")
+    def _sync_email_local(self, key: str, email: str) -> str:
+        """Keep email_local in step with email on every assignment."""
+        self.email_local = email.partition("@")[0] if email else None
+        return email
+    
+    def _display_names(self) -> Tuple[str, str]:
+        """
+        Compute full name and initials in one pass over the name fields.
+        
+        Returns:
+            Tuple of (full_name, initials)
+        """
+        first_name = self.first_name
+        last_name = self.last_name
+        if first_name and last_name:
+            return f"{first_name} {last_name}", f"{first_name[0]}{last_name[0]}".upper()
+        if first_name:
+            return first_name, first_name[0].upper()
+        email = self.email
+        if last_name:
+            return last_name, email[0].upper()
+        return self.email_local, email[0].upper()
+    
     @property
     def full_name(self) -> str:
         """Get user's full name."""
-        if self.first_name and self.last_name:
-            return f"{self.first_name} {self.last_name}"
-        elif self.first_name:
-            return self.first_name
-        elif self.last_name:
-            return self.last_name
-        else:
-            return self.email.split("@")[0]
+        return self._display_names()[0]
     
     @property
     def initials(self) -> str:
         """Get user's initials."""
-        if self.first_name and self.last_name:
-            return f"{self.first_name[0]}{self.last_name[0]}".upper()
-        elif self.first_name:
-            return self.first_name[0].upper()
-        else:
-            return self.email[0].upper()
+        return self._display_names()[1]
     
     def update_last_login(self) -> None:
         """Update last login timestamp and increment login count."""
         self.last_login = datetime.utcnow()
         self.login_count += 1
     
-    def is_password_reset_valid(self) -> bool:
-        """Check if password reset token is still valid."""
+    @classmethod
+    async def bulk_update_last_login(
+        cls,
+        session: AsyncSession,
+        user_ids: List[str],
+        now: Optional[datetime] = None,
+    ) -> None:
+        """
+        Record a login for many users in one UPDATE.
+        
+        Args:
+            session: Database session
+            user_ids: IDs of users who logged in
+            now: Login timestamp (defaults to current UTC time)
+        """
+        if not user_ids:
+            return
+        
+        await session.execute(
+            update(cls)
+            .where(cls.id.in_(user_ids))
+            .values(login_count=cls.login_count + 1, last_login=now or datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+    
+    def is_password_reset_valid(self, now: Optional[datetime] = None) -> bool:
+        """
+        Check if password reset token is still valid.
+        
+        Args:
+            now: Current UTC time, to share one clock read across many checks
+        """
         if not self.reset_token or not self.reset_token_expires:
             return False
-        return datetime.utcnow() < self.reset_token_expires
+        return (now or datetime.utcnow()) < self.reset_token_expires
     
-    def is_verification_valid(self) -> bool:
-        """Check if email verification token is still valid."""
+    def is_verification_valid(self, now: Optional[datetime] = None) -> bool:
+        """
+        Check if email verification token is still valid.
+        
+        Args:
+            now: Current UTC time, to share one clock read across many checks
+        """
         if not self.verification_token or not self.verification_token_expires:
             return False
-        return datetime.utcnow() < self.verification_token_expires
+        return (now or datetime.utcnow()) < self.verification_token_expires
+    
+    @classmethod
+    async def expire_stale_tokens(cls, session: AsyncSession, now: Optional[datetime] = None) -> int:
+        """
+        Clear expired reset and verification tokens for all users in one UPDATE.
+        
+        Args:
+            session: Database session
+            now: Cutoff time (defaults to current UTC time)
+            
+        Returns:
+            Number of users whose tokens were cleared
+        """
+        now = now or datetime.utcnow()
+        reset_expired = cls.reset_token_expires < now
+        verification_expired = cls.verification_token_expires < now
+        
+        result = await session.execute(
+            update(cls)
+            .where(or_(reset_expired, verification_expired))
+            .values(
+                reset_token=case((reset_expired, None), else_=cls.reset_token),
+                reset_token_expires=case((reset_expired, None), else_=cls.reset_token_expires),
+                verification_token=case((verification_expired, None), else_=cls.verification_token),
+                verification_token_expires=case(
+                    (verification_expired, None), else_=cls.verification_token_expires
+                ),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
     
     def clear_reset_token(self) -> None:
         """Clear password reset token."""
@@ -170,22 +276,26 @@ class User(Base):
             include_sensitive: Whether to include sensitive fields
             
         Returns:
-            Dictionary representation of user
+            Dictionary representation of user (datetimes are not stringified,
+            so encode with orjson or a datetime-aware encoder)
         """
+        full_name, initials = self._display_names()
         data = {
             "id": self.id,
             "email": self.email,
             "first_name": self.first_name,
             "last_name": self.last_name,
-            "full_name": self.full_name,
-            "initials": self.initials,
+            "full_name": full_name,
+            "initials": initials,
+            # Deferred with raiseload: queries feeding this must undefer it
             "profile_image_url": self.profile_image_url,
             "is_active": self.is_active,
             "email_verified": self.email_verified,
-            "last_login": self.last_login.isoformat() if self.last_login else None,
+            # Datetimes stay native; orjson formats them in C when encoding
+            "last_login": self.last_login,
             "login_count": self.login_count,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat(),
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
         }
         
         if include_sensitive:
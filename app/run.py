@@ -7,6 +7,7 @@ import os
 import sys
 import asyncio
 import argparse
+from importlib.util import find_spec
 from pathlib import Path
 
 # Add app directory to Python path
@@ -52,6 +53,17 @@ def main():
     
     args = parser.parse_args()
     
+    # WebSocket connections and dataset watchers live in process memory
+    # (services.websocket), so events raised in one worker never reach clients
+    # connected to another. Keep a single worker until fan-out goes through
+    # a shared broker.
+    workers = 1 if args.reload else args.workers
+    
+    # uvloop/httptools ship with uvicorn[standard] (uvloop is unavailable on
+    # Windows); fall back to the pure-Python implementations without them
+    loop = "uvloop" if find_spec("uvloop") else "asyncio"
+    http = "httptools" if find_spec("httptools") else "h11"
+    
     # Print startup information
     print(f"🚀 Starting {settings.app_name} v{settings.version}")
     print(f"📊 Environment: {settings.environment}")
@@ -59,6 +71,7 @@ def main():
     print(f"📚 API Docs: http://{args.host}:{args.port}/docs")
     print(f"🔧 Interactive Docs: http://{args.host}:{args.port}/redoc")
     print(f"💬 WebSocket: ws://{args.host}:{args.port}/ws")
+    print(f"⚙️  Workers: {workers} ({loop} + {http})")
     print("-" * 50)
     
     # Run server
@@ -67,7 +80,9 @@ def main():
         host=args.host,
         port=args.port,
         reload=args.reload,
-        workers=args.workers if not args.reload else 1,
+        workers=workers,
+        loop=loop,
+        http=http,
         log_level=args.log_level,
         access_log=settings.debug,
         app_dir=str(app_dir),
@@ -2,8 +2,9 @@
 Pydantic schemas for dataset-related data validation and serialization.
 """
 
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, List, Dict, Any, Union
+from typing import Annotated, Optional, List, Dict, Any, Union
 from pydantic import BaseModel, Field, ConfigDict, field_validator
 
 
@@ -58,24 +59,26 @@ class DatasetUpdate(BaseModel):
     )
 
 
-class DatasetMetadata(BaseModel):
+@dataclass(slots=True, frozen=True)
+class DatasetMetadata:
     """Schema for dataset metadata."""
     
-    row_count: int = Field(..., description="Number of rows in dataset")
-    column_count: int = Field(..., description="Number of columns in dataset")
-    columns: List[str] = Field(..., description="List of column names")
-    column_types: Dict[str, str] = Field(..., description="Column data types")
-    size_mb: float = Field(..., description="Dataset size in MB")
-    updated_at: str = Field(..., description="Metadata last updated timestamp")
+    row_count: Annotated[int, Field(description="Number of rows in dataset")]
+    column_count: Annotated[int, Field(description="Number of columns in dataset")]
+    columns: Annotated[List[str], Field(description="List of column names")]
+    column_types: Annotated[Dict[str, str], Field(description="Column data types")]
+    size_mb: Annotated[float, Field(description="Dataset size in MB")]
+    updated_at: Annotated[str, Field(description="Metadata last updated timestamp")]
 
 
-class FileInfo(BaseModel):
+@dataclass(slots=True, frozen=True)
+class FileInfo:
     """Schema for file information."""
     
-    filename: str = Field(..., description="Original filename")
-    size: int = Field(..., description="File size in bytes")
-    mime_type: str = Field(..., description="File MIME type")
-    created_from_version: Optional[int] = Field(None, description="Version this was created from")
+    filename: Annotated[str, Field(description="Original filename")]
+    size: Annotated[int, Field(description="File size in bytes")]
+    mime_type: Annotated[str, Field(description="File MIME type")]
+    created_from_version: Annotated[Optional[int], Field(description="Version this was created from")] = None
 
 
 class DatasetResponse(DatasetBase):
@@ -141,9 +144,10 @@ class DatasetUpload(BaseModel):
         if v is not None:
             if len(v) > 10:
                 raise ValueError('Maximum 10 tags allowed')
-            for tag in v:
-                if len(tag) > 50:
-                    raise ValueError('Tag length cannot exceed 50 characters')
+            if any(len(tag) > 50 for tag in v):
+                raise ValueError('Tag length cannot exceed 50 characters')
+            # Drop duplicates, keeping first-seen order
+            v = list(dict.fromkeys(v))
         return v
 
 
@@ -160,6 +164,7 @@ class DatasetProcessingStatus(BaseModel):
 
 
 selection_strategies = ["all", "sample", "custom"]
+_SELECTION_STRATEGIES = frozenset(selection_strategies)
 
 
 class ColumnSelection(BaseModel):
@@ -172,31 +177,36 @@ class ColumnSelection(BaseModel):
     @field_validator('strategy')
     @classmethod
     def validate_strategy(cls, v):
-        if v not in selection_strategies:
+        if v not in _SELECTION_STRATEGIES:
             raise ValueError(f'Strategy must be one of: {selection_strategies}')
         return v
 
 
-class DatasetVersion(BaseModel):
+@dataclass(slots=True, frozen=True)
+class DatasetVersion:
     """Schema for dataset versioning."""
     
-    version: int = Field(..., description="Version number")
-    description: str = Field(..., description="Version description")
-    changes: List[str] = Field(..., description="List of changes made")
-    created_at: datetime = Field(..., description="Version creation time")
-    created_by: str = Field(..., description="User who created this version")
+    version: Annotated[int, Field(description="Version number")]
+    description: Annotated[str, Field(description="Version description")]
+    changes: Annotated[List[str], Field(description="List of changes made")]
+    created_at: Annotated[datetime, Field(description="Version creation time")]
+    created_by: Annotated[str, Field(description="User who created this version")]
 
 
-class DatasetStats(BaseModel):
+@dataclass(slots=True, frozen=True)
+class DatasetStats:
     """Schema for dataset statistics."""
     
-    total_datasets: int = Field(..., description="Total number of datasets")
-    public_datasets: int = Field(..., description="Number of public datasets")
-    processed_datasets: int = Field(..., description="Number of processed datasets")
-    total_size_mb: float = Field(..., description="Total size of all datasets in MB")
-    avg_rows_per_dataset: float = Field(..., description="Average rows per dataset")
-    most_common_tags: List[Dict[str, Union[str, int]]] = Field(..., description="Most common tags")
-    processing_success_rate: float = Field(..., description="Processing success rate percentage")
+    total_datasets: Annotated[int, Field(description="Total number of datasets")]
+    public_datasets: Annotated[int, Field(description="Number of public datasets")]
+    processed_datasets: Annotated[int, Field(description="Number of processed datasets")]
+    total_size_mb: Annotated[float, Field(description="Total size of all datasets in MB")]
+    avg_rows_per_dataset: Annotated[float, Field(description="Average rows per dataset")]
+    most_common_tags: Annotated[List[Dict[str, Union[str, int]]], Field(description="Most common tags")]
+    processing_success_rate: Annotated[float, Field(description="Processing success rate percentage")]
+
+
+_SORT_ORDERS = frozenset(("asc", "desc"))
 
 
 class DatasetSearch(BaseModel):
@@ -216,6 +226,6 @@ class DatasetSearch(BaseModel):
     @field_validator('sort_order')
     @classmethod
     def validate_sort_order(cls, v):
-        if v not in ["asc", "desc"]:
+        if v not in _SORT_ORDERS:
             raise ValueError('Sort order must be "asc" or "desc"')
         return v
\ No newline at end of file
@@ -3,24 +3,19 @@ Pydantic schemas for machine learning processing and results.
 """
 
 from datetime import datetime
-from typing import Optional, List, Dict, Any, Union, Tuple
-from pydantic import BaseModel, Field, ConfigDict, field_validator
-from enum import Enum
+from typing import Annotated, Optional, List, Dict, Any, Literal, Union, Tuple
+from pydantic import BaseModel, Field, ConfigDict, PositiveFloat, SkipValidation, StrictFloat, model_validator
 
 
-class ReductionMethod(str, Enum):
-    """Dimensionality reduction methods."""
-    TSNE = "tsne"
-    UMAP = "umap"
-    PCA = "pca"
+# Literal choices are checked by pydantic-core without a Python validator call
+ReductionMethod = Literal["tsne", "umap", "pca"]
+ClusteringMethod = Literal["kmeans", "dbscan", "hdbscan", "agglomerative"]
+DistanceMetric = Literal["euclidean", "manhattan", "cosine", "chebyshev", "minkowski"]
+MissingValueStrategy = Literal["drop", "mean", "median", "mode", "zero"]
 
-
-class ClusteringMethod(str, Enum):
-    """Clustering methods."""
-    KMEANS = "kmeans"
-    DBSCAN = "dbscan"
-    HDBSCAN = "hdbscan"
-    AGGLOMERATIVE = "agglomerative"
+# Server-produced coordinates are always floats, so take pydantic-core's strict
+# float path (no int/str coercion attempts). A NamedTuple was measured slower.
+Vec3 = Tuple[StrictFloat, StrictFloat, StrictFloat]
 
 
 class MLConfigBase(BaseModel):
@@ -35,33 +30,27 @@ class MLConfigBase(BaseModel):
 class TSNEConfig(BaseModel):
     """t-SNE specific configuration."""
     
+    method: Literal["tsne"] = Field("tsne", description="Method tag")
     perplexity: float = Field(30.0, ge=5.0, le=50.0, description="t-SNE perplexity parameter")
-    learning_rate: Union[float, str] = Field("auto", description="Learning rate")
+    learning_rate: Union[PositiveFloat, Literal["auto"]] = Field("auto", description="Learning rate")
     n_iter: int = Field(1000, ge=250, le=5000, description="Number of iterations")
-    metric: str = Field("euclidean", description="Distance metric")
-    
-    @field_validator('learning_rate')
-    @classmethod
-    def validate_learning_rate(cls, v):
-        if isinstance(v, str) and v != "auto":
-            raise ValueError('Learning rate must be "auto" or a positive number')
-        if isinstance(v, (int, float)) and v <= 0:
-            raise ValueError('Learning rate must be positive')
-        return v
+    metric: DistanceMetric = Field("euclidean", description="Distance metric")
 
 
 class UMAPConfig(BaseModel):
     """UMAP specific configuration."""
     
+    method: Literal["umap"] = Field("umap", description="Method tag")
     n_neighbors: int = Field(15, ge=2, le=100, description="Number of neighbors")
     min_dist: float = Field(0.1, ge=0.0, le=1.0, description="Minimum distance")
-    metric: str = Field("euclidean", description="Distance metric")
+    metric: DistanceMetric = Field("euclidean", description="Distance metric")
     n_epochs: Optional[int] = Field(None, ge=50, le=1000, description="Number of epochs")
 
 
 class PCAConfig(BaseModel):
     """PCA specific configuration."""
     
+    method: Literal["pca"] = Field("pca", description="Method tag")
     n_components: int = Field(3, ge=2, le=10, description="Number of components")
     whiten: bool = Field(False, description="Whether to whiten the components")
 
@@ -69,8 +58,9 @@ class PCAConfig(BaseModel):
 class KMeansConfig(BaseModel):
     """K-Means clustering configuration."""
     
+    method: Literal["kmeans"] = Field("kmeans", description="Method tag")
     n_clusters: int = Field(3, ge=2, le=20, description="Number of clusters")
-    init: str = Field("k-means++", description="Initialization method")
+    init: Literal["k-means++", "random"] = Field("k-means++", description="Initialization method")
     max_iter: int = Field(300, ge=100, le=1000, description="Maximum iterations")
     tol: float = Field(1e-4, description="Tolerance for convergence")
 
@@ -78,14 +68,16 @@ class KMeansConfig(BaseModel):
 class DBSCANConfig(BaseModel):
     """DBSCAN clustering configuration."""
     
+    method: Literal["dbscan"] = Field("dbscan", description="Method tag")
     eps: float = Field(0.5, gt=0, description="Maximum distance between samples")
     min_samples: int = Field(5, ge=1, description="Minimum samples in neighborhood")
-    metric: str = Field("euclidean", description="Distance metric")
+    metric: DistanceMetric = Field("euclidean", description="Distance metric")
 
 
 class HDBSCANConfig(BaseModel):
     """HDBSCAN clustering configuration."""
     
+    method: Literal["hdbscan"] = Field("hdbscan", description="Method tag")
     min_cluster_size: int = Field(5, ge=2, description="Minimum cluster size")
     min_samples: Optional[int] = Field(None, ge=1, description="Minimum samples")
     cluster_selection_epsilon: float = Field(0.0, ge=0.0, description="Cluster selection epsilon")
@@ -94,31 +86,38 @@ class HDBSCANConfig(BaseModel):
 class AgglomerativeConfig(BaseModel):
     """Agglomerative clustering configuration."""
     
+    method: Literal["agglomerative"] = Field("agglomerative", description="Method tag")
     n_clusters: int = Field(3, ge=2, le=20, description="Number of clusters")
-    linkage: str = Field("ward", description="Linkage criterion")
+    linkage: Literal["ward", "complete", "average", "single"] = Field("ward", description="Linkage criterion")
     distance_threshold: Optional[float] = Field(None, ge=0, description="Distance threshold")
 
 
 class AnomalyDetectionConfig(BaseModel):
     """Anomaly detection configuration."""
     
-    method: str = Field("isolation_forest", description="Anomaly detection method")
+    method: Literal["isolation_forest"] = Field("isolation_forest", description="Anomaly detection method")
     contamination: float = Field(0.1, ge=0.01, le=0.5, description="Expected contamination ratio")
     random_state: int = Field(42, description="Random state")
 
 
+# Tagged unions: pydantic-core dispatches on ``method`` instead of trying
+# one Optional field per algorithm
+ReductionParams = Annotated[
+    Union[TSNEConfig, UMAPConfig, PCAConfig],
+    Field(discriminator="method"),
+]
+ClusteringParams = Annotated[
+    Union[KMeansConfig, DBSCANConfig, HDBSCANConfig, AgglomerativeConfig],
+    Field(discriminator="method"),
+]
+
+
 class MLConfig(MLConfigBase):
     """Complete ML processing configuration."""
     
-    # Method-specific configurations
-    tsne_config: Optional[TSNEConfig] = Field(None, description="t-SNE configuration")
-    umap_config: Optional[UMAPConfig] = Field(None, description="UMAP configuration")
-    pca_config: Optional[PCAConfig] = Field(None, description="PCA configuration")
-    
-    kmeans_config: Optional[KMeansConfig] = Field(None, description="K-Means configuration")
-    dbscan_config: Optional[DBSCANConfig] = Field(None, description="DBSCAN configuration")
-    hdbscan_config: Optional[HDBSCANConfig] = Field(None, description="HDBSCAN configuration")
-    agglomerative_config: Optional[AgglomerativeConfig] = Field(None, description="Agglomerative configuration")
+    # Method-specific configurations (defaults are used when omitted)
+    reduction_params: Optional[ReductionParams] = Field(None, description="Parameters for the reduction method")
+    clustering_params: Optional[ClusteringParams] = Field(None, description="Parameters for the clustering method")
     
     anomaly_config: Optional[AnomalyDetectionConfig] = Field(None, description="Anomaly detection configuration")
     
@@ -130,7 +129,7 @@ class MLConfig(MLConfigBase):
     
     # Preprocessing options
     normalize_features: bool = Field(True, description="Whether to normalize features")
-    handle_missing: str = Field("drop", description="How to handle missing values")
+    handle_missing: MissingValueStrategy = Field("drop", description="How to handle missing values")
     
     # Performance options
     max_samples: Optional[int] = Field(None, ge=100, description="Maximum samples to process")
@@ -142,12 +141,14 @@ class MLConfig(MLConfigBase):
                 "reduction_method": "tsne",
                 "clustering_method": "kmeans",
                 "detect_anomalies": True,
-                "tsne_config": {
+                "reduction_params": {
+                    "method": "tsne",
                     "perplexity": 30.0,
                     "learning_rate": "auto",
                     "n_iter": 1000
                 },
-                "kmeans_config": {
+                "clustering_params": {
+                    "method": "kmeans",
                     "n_clusters": 5,
                     "init": "k-means++",
                     "max_iter": 300
@@ -159,27 +160,34 @@ class MLConfig(MLConfigBase):
         }
     )
     
-    @field_validator('handle_missing')
-    @classmethod
-    def validate_handle_missing(cls, v):
-        allowed = ["drop", "mean", "median", "mode", "zero"]
-        if v not in allowed:
-            raise ValueError(f'handle_missing must be one of: {allowed}')
-        return v
+    @model_validator(mode="after")
+    def validate_params_match_methods(self):
+        if self.reduction_params and self.reduction_params.method != self.reduction_method:
+            raise ValueError('reduction_params.method must match reduction_method')
+        if self.clustering_params and self.clustering_params.method != self.clustering_method:
+            raise ValueError('clustering_params.method must match clustering_method')
+        return self
 
 
 class DataPoint(BaseModel):
     """Schema for a 3D data point."""
     
     id: str = Field(..., description="Point unique identifier")
-    position: Tuple[float, float, float] = Field(..., description="3D coordinates (x, y, z)")
+    position: Vec3 = Field(..., description="3D coordinates (x, y, z)")
     color: str = Field(..., description="Point color (hex)")
     size: float = Field(1.0, ge=0.1, le=10.0, description="Point size")
     cluster: int = Field(-1, description="Cluster assignment (-1 for noise)")
     is_anomaly: bool = Field(False, description="Whether point is an anomaly")
-    original_data: Dict[str, Any] = Field(..., description="Original row data")
+    # Rows come from the stored dataset; skip walking every key on validation
+    original_data: SkipValidation[Dict[str, Any]] = Field(..., description="Original row data")
     
-    model_config = ConfigDict(from_attributes=True)
+    # Never mutated after construction
+    model_config = ConfigDict(
+        from_attributes=True,
+        frozen=True,
+        extra="forbid",
+        revalidate_instances="never",
+    )
 
 
 class Cluster(BaseModel):
@@ -188,10 +196,16 @@ class Cluster(BaseModel):
     id: int = Field(..., description="Cluster ID")
     color: str = Field(..., description="Cluster color (hex)")
     count: int = Field(..., description="Number of points in cluster")
-    center: Tuple[float, float, float] = Field(..., description="Cluster center coordinates")
+    center: Vec3 = Field(..., description="Cluster center coordinates")
     label: str = Field(..., description="Cluster label")
     
-    model_config = ConfigDict(from_attributes=True)
+    # Never mutated after construction
+    model_config = ConfigDict(
+        from_attributes=True,
+        frozen=True,
+        extra="forbid",
+        revalidate_instances="never",
+    )
 
 
 class ClusterAnalysis(BaseModel):
@@ -204,7 +218,13 @@ class ClusterAnalysis(BaseModel):
     key_features: List[str] = Field(..., description="Most important features")
     representative_points: Optional[List[str]] = Field(None, description="IDs of representative points")
     
-    model_config = ConfigDict(from_attributes=True)
+    # Never mutated after construction
+    model_config = ConfigDict(
+        from_attributes=True,
+        frozen=True,
+        extra="forbid",
+        revalidate_instances="never",
+    )
 
 
 class ProcessingMetadata(BaseModel):
@@ -217,7 +237,13 @@ class ProcessingMetadata(BaseModel):
     features_used: List[str] = Field(..., description="Features used in processing")
     preprocessing_steps: List[str] = Field(..., description="Preprocessing steps applied")
     
-    model_config = ConfigDict(from_attributes=True)
+    # Never mutated after construction
+    model_config = ConfigDict(
+        from_attributes=True,
+        frozen=True,
+        extra="forbid",
+        revalidate_instances="never",
+    )
 
 
 class ProcessingResult(BaseModel):
@@ -246,7 +272,8 @@ class ProcessingRequest(BaseModel):
                     "reduction_method": "tsne",
                     "clustering_method": "kmeans",
                     "detect_anomalies": True,
-                    "kmeans_config": {
+                    "clustering_params": {
+                        "method": "kmeans",
                         "n_clusters": 5
                     }
                 }
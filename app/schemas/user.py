@@ -2,15 +2,42 @@
 Pydantic schemas for user-related data validation and serialization.
 """
 
+import re
 from datetime import datetime
-from typing import Optional, List
-from pydantic import BaseModel, EmailStr, Field, ConfigDict
+from typing import Annotated, Optional, List, Literal
+from pydantic import AfterValidator, BaseModel, EmailStr, Field, ConfigDict
+
+
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+
+def _validate_email_syntax(v: str) -> str:
+    """
+    Cheap syntactic email check for login and stored-user paths.
+    
+    Args:
+        v: Email address
+        
+    Returns:
+        Email with its domain lowercased, as EmailStr normalizes it
+        
+    Raises:
+        ValueError: If the address is not of the form local@domain.tld
+    """
+    if not _EMAIL_RE.match(v):
+        raise ValueError("value is not a valid email address")
+    local, _, domain = v.rpartition("@")
+    return f"{local}@{domain.lower()}"
+
+
+# Full RFC validation (EmailStr) is kept where addresses enter the system
+FastEmail = Annotated[str, AfterValidator(_validate_email_syntax)]
 
 
 class UserBase(BaseModel):
     """Base user schema with common fields."""
     
-    email: EmailStr = Field(..., description="User's email address")
+    email: FastEmail = Field(..., description="User's email address")
     first_name: Optional[str] = Field(None, min_length=1, max_length=50, description="User's first name")
     last_name: Optional[str] = Field(None, min_length=1, max_length=50, description="User's last name")
     profile_image_url: Optional[str] = Field(None, description="URL to user's profile image")
@@ -19,6 +46,7 @@ class UserBase(BaseModel):
 class UserCreate(UserBase):
     """Schema for creating a new user."""
     
+    email: EmailStr = Field(..., description="User's email address")
     password: str = Field(..., min_length=8, max_length=128, description="User's password")
     confirm_password: str = Field(..., description="Password confirmation")
     
@@ -148,7 +176,7 @@ class EmailVerification(BaseModel):
 class UserLogin(BaseModel):
     """Schema for user login."""
     
-    email: EmailStr = Field(..., description="User's email address")
+    email: FastEmail = Field(..., description="User's email address")
     password: str = Field(..., description="User's password")
     remember_me: bool = Field(False, description="Whether to remember the login")
     
@@ -223,7 +251,7 @@ class UserSettings(BaseModel):
     
     email_notifications: bool = Field(True, description="Enable email notifications")
     dataset_public_by_default: bool = Field(False, description="Make datasets public by default")
-    preferred_theme: str = Field("light", description="Preferred UI theme")
+    preferred_theme: Literal["light", "dark"] = Field("light", description="Preferred UI theme")
     preferred_language: str = Field("en", description="Preferred language")
     
     model_config = ConfigDict(
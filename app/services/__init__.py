@@ -1,15 +1,38 @@
 """
 Services module for Data Mirage application.
+
+Services are imported on first attribute access (PEP 562), so importing
+e.g. ``services.auth`` does not pull in scikit-learn via ``ml_processor``.
 """
 
-from .auth import AuthService
-from .ml_processor import MLProcessor
-from .rag_service import RAGService
-from .websocket import WebSocketManager
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .auth import AuthService
+    from .ml_processor import MLProcessor
+    from .rag_service import RAGService
+    from .websocket import WebSocketManager
+
+_LAZY_IMPORTS = {
+    "AuthService": ".auth",
+    "MLProcessor": ".ml_processor",
+    "RAGService": ".rag_service",
+    "WebSocketManager": ".websocket",
+}
 
 __all__ = [
     "AuthService",
     "MLProcessor", 
     "RAGService",
     "WebSocketManager",
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,15 +3,23 @@ Authentication service for user management and JWT token handling.
 Provides comprehensive authentication features including registration, login, password reset, etc.
 """
 
-import uuid
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+from typing import Any, Callable, Dict, List, Optional
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update, delete
-from sqlalchemy.orm import selectinload
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import joinedload, load_only, undefer
+from sqlalchemy.orm.attributes import set_committed_value
 
 from core.security import (
+    ACCESS_TOKEN_EXPIRE_SECONDS,
+    dummy_verify_password,
     verify_password,
+    verify_and_update_password,
     get_password_hash,
     create_access_token,
     create_refresh_token,
@@ -32,6 +40,43 @@ from schemas.user import (
     SessionResponse,
 )
 from core.config import settings
+from core.database import utcnow
+
+# Columns a login reads: credentials plus everything UserResponse renders.
+# Admin and reset/verification token columns are left unloaded.
+_LOGIN_COLUMNS = (
+    User.id,
+    User.email,
+    User.email_local,
+    User.hashed_password,
+    User.first_name,
+    User.last_name,
+    User.profile_image_url,
+    User.is_active,
+    User.email_verified,
+    User.last_login,
+    User.login_count,
+    User.created_at,
+    User.updated_at,
+)
+
+# Password hashing runs here rather than in asyncio's default pool, so each
+# process holds at most this many Argon2 buffers (memory_cost each) at once
+_HASH_EXECUTOR = ThreadPoolExecutor(
+    max_workers=min(4, os.cpu_count() or 1),
+    thread_name_prefix="password-hash",
+)
+
+# Validates a whole result list in one pydantic-core call
+_SESSION_LIST_ADAPTER = TypeAdapter(List[SessionResponse])
+
+# Dialect inserts supporting ON CONFLICT, for the databases settings accepts
+_CONFLICT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+async def _run_hash(func: Callable[..., Any], *args: Any) -> Any:
+    """Run a password hashing function on the bounded hashing pool."""
+    return await asyncio.get_running_loop().run_in_executor(_HASH_EXECUTOR, func, *args)
 
 
 class AuthenticationError(Exception):
@@ -113,29 +158,32 @@ class AuthService:
         # Validate password strength
         validate_password_strength(user_data.password)
         
-        # Check if user already exists
-        existing_user = await self.get_user_by_email(user_data.email)
-        if existing_user:
-            raise UserExistsError(f"User with email {user_data.email} already exists")
-        
         try:
-            # Hash password
-            hashed_password = get_password_hash(user_data.password)
-            
-            # Create user
-            user = User(
-                id=str(uuid.uuid4()),
-                email=user_data.email,
-                hashed_password=hashed_password,
-                first_name=user_data.first_name,
-                last_name=user_data.last_name,
-                profile_image_url=user_data.profile_image_url,
-                is_active=True,
-                email_verified=False,  # Will be verified via email
+            # Hash password off the event loop; argon2 and bcrypt release the GIL
+            hashed_password = await _run_hash(get_password_hash, user_data.password)
+            
+            # Create user in one round-trip; the unique email index settles races
+            insert = _CONFLICT_INSERTS[self.session.bind.dialect.name]
+            stmt = (
+                insert(User)
+                .values(
+                    email=user_data.email,
+                    email_local=user_data.email.partition("@")[0],
+                    hashed_password=hashed_password,
+                    first_name=user_data.first_name,
+                    last_name=user_data.last_name,
+                    profile_image_url=user_data.profile_image_url,
+                    is_active=True,
+                    email_verified=False,  # Will be verified via email
+                )
+                .on_conflict_do_nothing(index_elements=[User.email])
+                .returning(User)
             )
-            
-            self.session.add(user)
-            await self.session.flush()  # Get the user ID
+            user = (await self.session.scalars(stmt)).one_or_none()
+            if user is None:
+                raise UserExistsError(f"User with email {user_data.email} already exists")
+            # Deferred columns are not returned; the inserted value is known
+            set_committed_value(user, "profile_image_url", user_data.profile_image_url)
             
             # Create initial session
             session_data = await self._create_user_session(
@@ -154,7 +202,7 @@ class AuthService:
                 access_token=access_token,
                 refresh_token=refresh_token,
                 token_type="bearer",
-                expires_in=settings.security_settings.access_token_expire_minutes * 60,
+                expires_in=ACCESS_TOKEN_EXPIRE_SECONDS,
                 user=UserResponse.model_validate(user)
             )
             
@@ -164,7 +212,7 @@ class AuthService:
             
         except Exception as e:
             await self.session.rollback()
-            if isinstance(e, (PasswordError, SecurityError)):
+            if isinstance(e, (PasswordError, SecurityError, UserExistsError)):
                 raise
             raise SecurityError(f"Registration failed: {str(e)}")
     
@@ -198,19 +246,26 @@ class AuthService:
         """
         try:
             # Get user by email
-            user = await self.get_user_by_email(email)
+            user = await self.get_login_user(email)
             if not user:
+                # Hash anyway so unknown emails take as long as wrong passwords
+                await _run_hash(dummy_verify_password)
                 raise InvalidCredentialsError("Invalid email or password")
             
             # Verify password
-            if not verify_password(password, user.hashed_password):
+            verified, new_hash = await _run_hash(
+                verify_and_update_password, password, user.hashed_password
+            )
+            if not verified:
                 raise InvalidCredentialsError("Invalid email or password")
             
             # Check if account is active
             if not user.is_active:
                 raise AccountDisabledError("Account is disabled")
             
-            # Update login information
+            # Update login information; upgraded hashes ride along in the same UPDATE
+            if new_hash:
+                user.hashed_password = new_hash
             user.update_last_login()
             
             # Create session
@@ -264,14 +319,18 @@ class AuthService:
         try:
             # Find session with refresh token
             stmt = select(Session).where(
-                Session.refresh_token == refresh_token,
-                Session.is_active == True
-            ).options(selectinload(Session.user))
+                Session.refresh_token_hash == Session.hash_token(refresh_token),
+                Session.is_active == True,
+                Session.expires_at > utcnow(),
+            ).options(
+                # Many-to-one on a single row: one JOIN beats a second SELECT ... IN
+                joinedload(Session.user, innerjoin=True).undefer(User.profile_image_url)
+            )
             
             result = await self.session.execute(stmt)
             session_data = result.scalar_one_or_none()
             
-            if not session_data or not session_data.is_valid:
+            if not session_data:
                 raise TokenError("Invalid or expired refresh token")
             
             user = session_data.user
@@ -306,6 +365,7 @@ class AuthService:
         user_id: str,
         session_id: Optional[str] = None,
         all_sessions: bool = False,
+        commit: bool = True,
     ) -> bool:
         """
         Logout user by revoking sessions.
@@ -314,6 +374,8 @@ class AuthService:
             user_id: User ID
             session_id: Specific session to revoke (optional)
             all_sessions: Whether to revoke all user sessions
+            commit: Whether to commit; pass False to revoke inside the
+                caller's transaction
             
         Returns:
             True if logout successful
@@ -326,7 +388,7 @@ class AuthService:
                     Session.is_active == True
                 ).values(
                     is_active=False,
-                    revoked_at=datetime.utcnow()
+                    revoked_at=utcnow()
                 )
             elif session_id:
                 # Revoke specific session
@@ -336,14 +398,15 @@ class AuthService:
                     Session.is_active == True
                 ).values(
                     is_active=False,
-                    revoked_at=datetime.utcnow()
+                    revoked_at=utcnow()
                 )
             else:
                 # This shouldn't happen, but handle gracefully
                 return False
             
             result = await self.session.execute(stmt)
-            await self.session.commit()
+            if commit:
+                await self.session.commit()
             
             return result.rowcount > 0
             
@@ -362,7 +425,11 @@ class AuthService:
             User object if found, None otherwise
         """
         try:
-            stmt = select(User).where(User.id == user_id)
+            stmt = (
+                select(User)
+                .where(User.id == user_id)
+                .options(undefer(User.profile_image_url))
+            )
             result = await self.session.execute(stmt)
             return result.scalar_one_or_none()
         except Exception:
@@ -379,7 +446,33 @@ class AuthService:
             User object if found, None otherwise
         """
         try:
-            stmt = select(User).where(User.email == email)
+            stmt = (
+                select(User)
+                .where(User.email == email)
+                .options(undefer(User.profile_image_url))
+            )
+            result = await self.session.execute(stmt)
+            return result.scalar_one_or_none()
+        except Exception:
+            return None
+    
+    async def get_login_user(self, email: str) -> Optional[User]:
+        """
+        Get only the columns a login needs for a user.
+        
+        Args:
+            email: Email address
+            
+        Returns:
+            User object with only the login columns loaded, None if not found
+        """
+        try:
+            stmt = (
+                select(User)
+                .where(User.email == email)
+                # raiseload: touching a skipped column fails loudly, not with a lazy SELECT
+                .options(load_only(*_LOGIN_COLUMNS, raiseload=True))
+            )
             result = await self.session.execute(stmt)
             return result.scalar_one_or_none()
         except Exception:
@@ -452,18 +545,18 @@ class AuthService:
                 raise UserNotFoundError("User not found")
             
             # Verify current password
-            if not verify_password(current_password, user.hashed_password):
+            if not await _run_hash(verify_password, current_password, user.hashed_password):
                 raise InvalidCredentialsError("Current password is incorrect")
             
             # Validate new password
             validate_password_strength(new_password)
             
             # Update password
-            user.hashed_password = get_password_hash(new_password)
+            user.hashed_password = await _run_hash(get_password_hash, new_password)
             
-            # Optionally revoke other sessions
+            # Optionally revoke other sessions, in the same transaction
             if revoke_other_sessions:
-                await self.logout_user(user_id, all_sessions=True)
+                await self.logout_user(user_id, all_sessions=True, commit=False)
             
             await self.session.commit()
             return True
@@ -493,7 +586,7 @@ class AuthService:
             result = await self.session.execute(stmt)
             sessions = result.scalars().all()
             
-            return [SessionResponse.model_validate(s) for s in sessions]
+            return _SESSION_LIST_ADAPTER.validate_python(sessions, from_attributes=True)
             
         except Exception:
             return []
@@ -528,9 +621,8 @@ class AuthService:
         
         # Create session
         session_data = Session(
-            id=str(uuid.uuid4()),
             user_id=user.id,
-            refresh_token=refresh_token,
+            refresh_token_hash=Session.hash_token(refresh_token),
             device_info=device_info,
             ip_address=ip_address,
             user_agent=user_agent,
@@ -540,27 +632,25 @@ class AuthService:
         self.session.add(session_data)
         return session_data
     
-    async def cleanup_expired_sessions(self) -> int:
+    async def cleanup_expired_sessions(self, batch_size: int = 1000) -> int:
         """
-        Clean up expired sessions.
+        Clean up expired sessions, committing in bounded batches.
         
+        Args:
+            batch_size: Sessions deactivated per UPDATE and transaction
+            
         Returns:
             Number of sessions cleaned up
         """
+        cleaned = 0
         try:
-            stmt = update(Session).where(
-                Session.expires_at < datetime.utcnow(),
-                Session.is_active == True
-            ).values(
-                is_active=False,
-                revoked_at=datetime.utcnow()
-            )
-            
-            result = await self.session.execute(stmt)
-            await self.session.commit()
-            
-            return result.rowcount
+            while True:
+                batch = await Session.cleanup_expired_bulk(self.session, limit=batch_size)
+                await self.session.commit()
+                cleaned += batch
+                if batch < batch_size:
+                    return cleaned
             
         except Exception:
             await self.session.rollback()
-            return 0
\ No newline at end of file
+            return cleaned
\ No newline at end of file
@@ -8,32 +8,61 @@ This module provides a comprehensive suite of ML algorithms and utilities for:
 - Model optimization and hyperparameter tuning
 - Performance validation and metrics
 - Explainability and feature importance analysis
+
+Algorithms are imported on first attribute access (PEP 562), so importing
+one submodule does not pull in UMAP, HDBSCAN and the rest of the stack.
 """
 
-from .processor import AdvancedMLProcessor
-from .base import MLAlgorithmBase, ProcessingPipeline
-from .dimensionality import (
-    TSNEReducer,
-    UMAPReducer,
-    PCAReducer,
-    KernelPCAReducer,
-    MDSReducer,
-)
-from .clustering import (
-    KMeansClusterer,
-    DBSCANClusterer,
-    HDBSCANClusterer,
-    AgglomerativeClusterer,
-    GaussianMixtureClusterer,
-)
-from .anomalies import (
-    IsolationForestDetector,
-    OneClassSVMDetector,
-    LocalOutlierFactorDetector,
-)
-from .optimization import HyperparameterOptimizer
-from .validation import ClusteringValidator
-from .preprocessing import DataPreprocessor
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .processor import AdvancedMLProcessor
+    from .base import MLAlgorithmBase, ProcessingPipeline
+    from .dimensionality import (
+        TSNEReducer,
+        UMAPReducer,
+        PCAReducer,
+        KernelPCAReducer,
+        MDSReducer,
+    )
+    from .clustering import (
+        KMeansClusterer,
+        DBSCANClusterer,
+        HDBSCANClusterer,
+        AgglomerativeClusterer,
+        GaussianMixtureClusterer,
+    )
+    from .anomalies import (
+        IsolationForestDetector,
+        OneClassSVMDetector,
+        LocalOutlierFactorDetector,
+    )
+    from .optimization import HyperparameterOptimizer
+    from .validation import ClusteringValidator
+    from .preprocessing import DataPreprocessor
+
+_LAZY_IMPORTS = {
+    "AdvancedMLProcessor": ".processor",
+    "MLAlgorithmBase": ".base",
+    "ProcessingPipeline": ".base",
+    "TSNEReducer": ".dimensionality",
+    "UMAPReducer": ".dimensionality",
+    "PCAReducer": ".dimensionality",
+    "KernelPCAReducer": ".dimensionality",
+    "MDSReducer": ".dimensionality",
+    "KMeansClusterer": ".clustering",
+    "DBSCANClusterer": ".clustering",
+    "HDBSCANClusterer": ".clustering",
+    "AgglomerativeClusterer": ".clustering",
+    "GaussianMixtureClusterer": ".clustering",
+    "IsolationForestDetector": ".anomalies",
+    "OneClassSVMDetector": ".anomalies",
+    "LocalOutlierFactorDetector": ".anomalies",
+    "HyperparameterOptimizer": ".optimization",
+    "ClusteringValidator": ".validation",
+    "DataPreprocessor": ".preprocessing",
+}
 
 __all__ = [
     "AdvancedMLProcessor",
@@ -55,4 +84,13 @@ __all__ = [
     "HyperparameterOptimizer",
     "ClusteringValidator",
     "DataPreprocessor",
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -39,6 +39,13 @@ from schemas.ml import (
     ProcessingMetadata,
     ProcessingProgress,
     ModelPerformance,
+    TSNEConfig,
+    UMAPConfig,
+    PCAConfig,
+    KMeansConfig,
+    DBSCANConfig,
+    HDBSCANConfig,
+    AgglomerativeConfig,
 )
 from core.config import settings
 
@@ -163,8 +170,8 @@ class MLProcessor:
             metadata = ProcessingMetadata(
                 total_points=len(points),
                 processing_time=processing_time,
-                reduction_method=config.reduction_method.value,
-                clustering_method=config.clustering_method.value,
+                reduction_method=config.reduction_method,
+                clustering_method=config.clustering_method,
                 features_used=feature_columns,
                 preprocessing_steps=preprocessing_steps,
             )
@@ -172,7 +179,9 @@ class MLProcessor:
             # Update progress
             await self._update_progress(dataset_id, "completed", 100, "Processing completed")
             
-            return ProcessingResult(
+            # Points and clusters are built from trusted model output; skip
+            # re-validating every nested DataPoint
+            return ProcessingResult.model_construct(
                 points=points,
                 clusters=clusters,
                 anomalies=[str(i) for i in anomaly_indices],
@@ -267,55 +276,41 @@ class MLProcessor:
         Returns:
             Reduced data as numpy array
         """
-        method = config.reduction_method.value
+        method = config.reduction_method
+        
+        # MLConfig guarantees reduction_params, when given, matches the method
+        params = config.reduction_params
         
         if method == "pca":
-            n_components = 3
-            if config.pca_config:
-                n_components = config.pca_config.n_components
-            
+            params = params or PCAConfig()
             reducer = PCA(
-                n_components=n_components,
+                n_components=params.n_components,
                 random_state=config.random_state,
-                whiten=config.pca_config.whiten if config.pca_config else False,
+                whiten=params.whiten,
             )
             
         elif method == "tsne":
-            perplexity = 30.0
-            learning_rate = "auto"
-            n_iter = 1000
-            
-            if config.tsne_config:
-                perplexity = config.tsne_config.perplexity
-                learning_rate = config.tsne_config.learning_rate
-                n_iter = config.tsne_config.n_iter
-            
+            params = params or TSNEConfig()
             reducer = TSNE(
                 n_components=3,
-                perplexity=perplexity,
-                learning_rate=learning_rate,
-                n_iter=n_iter,
+                perplexity=params.perplexity,
+                learning_rate=params.learning_rate,
+                n_iter=params.n_iter,
                 random_state=config.random_state,
-                metric=config.tsne_config.metric if config.tsne_config else "euclidean",
+                metric=params.metric,
             )
             
         elif method == "umap":
             if not HAS_UMAP:
                 raise UnsupportedMethodError("UMAP not available. Install umap-learn package.")
             
-            n_neighbors = 15
-            min_dist = 0.1
-            
-            if config.umap_config:
-                n_neighbors = config.umap_config.n_neighbors
-                min_dist = config.umap_config.min_dist
-            
+            params = params or UMAPConfig()
             reducer = umap.UMAP(
                 n_components=3,
-                n_neighbors=n_neighbors,
-                min_dist=min_dist,
+                n_neighbors=params.n_neighbors,
+                min_dist=params.min_dist,
                 random_state=config.random_state,
-                metric=config.umap_config.metric if config.umap_config else "euclidean",
+                metric=params.metric,
             )
             
         else:
@@ -347,55 +342,43 @@ class MLProcessor:
         Returns:
             Cluster labels as numpy array
         """
-        method = config.clustering_method.value
+        method = config.clustering_method
+        
+        # MLConfig guarantees clustering_params, when given, matches the method
+        params = config.clustering_params
         
         if method == "kmeans":
-            n_clusters = 3
-            if config.kmeans_config:
-                n_clusters = config.kmeans_config.n_clusters
-            
+            params = params or KMeansConfig()
             clusterer = KMeans(
-                n_clusters=n_clusters,
+                n_clusters=params.n_clusters,
                 random_state=config.random_state,
-                init=config.kmeans_config.init if config.kmeans_config else "k-means++",
-                max_iter=config.kmeans_config.max_iter if config.kmeans_config else 300,
+                init=params.init,
+                max_iter=params.max_iter,
             )
             
         elif method == "dbscan":
-            eps = 0.5
-            min_samples = 5
-            
-            if config.dbscan_config:
-                eps = config.dbscan_config.eps
-                min_samples = config.dbscan_config.min_samples
-            
+            params = params or DBSCANConfig()
             clusterer = DBSCAN(
-                eps=eps,
-                min_samples=min_samples,
-                metric=config.dbscan_config.metric if config.dbscan_config else "euclidean",
+                eps=params.eps,
+                min_samples=params.min_samples,
+                metric=params.metric,
             )
             
         elif method == "hdbscan":
             if not HAS_HDBSCAN:
                 raise UnsupportedMethodError("HDBSCAN not available. Install hdbscan package.")
             
-            min_cluster_size = 5
-            if config.hdbscan_config:
-                min_cluster_size = config.hdbscan_config.min_cluster_size
-            
+            params = params or HDBSCANConfig()
             clusterer = hdbscan.HDBSCAN(
-                min_cluster_size=min_cluster_size,
-                min_samples=config.hdbscan_config.min_samples if config.hdbscan_config else None,
+                min_cluster_size=params.min_cluster_size,
+                min_samples=params.min_samples,
             )
             
         elif method == "agglomerative":
-            n_clusters = 3
-            if config.agglomerative_config:
-                n_clusters = config.agglomerative_config.n_clusters
-            
+            params = params or AgglomerativeConfig()
             clusterer = AgglomerativeClustering(
-                n_clusters=n_clusters,
-                linkage=config.agglomerative_config.linkage if config.agglomerative_config else "ward",
+                n_clusters=params.n_clusters,
+                linkage=params.linkage,
             )
             
         else:
@@ -456,42 +439,49 @@ class MLProcessor:
         Returns:
             List of DataPoint objects
         """
-        points = []
-        
-        for i, (coords, cluster_id, row_data) in enumerate(
-            zip(reduced_data, cluster_labels, original_data)
-        ):
-            # Determine color
-            if i in anomaly_indices:
-                color = "#FF0000"  # Red for anomalies
-            elif cluster_id == -1:  # Noise points (DBSCAN)
-                color = "#808080"  # Gray for noise
-            else:
-                color = self.color_palette[cluster_id % len(self.color_palette)]
-            
-            # Determine size
-            size = 1.0
-            if config.size_column and config.size_column in row_data:
-                try:
-                    size_value = float(row_data[config.size_column])
-                    # Normalize size to 0.5-2.0 range
-                    size = max(0.5, min(2.0, size_value / 100.0))
-                except (ValueError, TypeError):
-                    size = 1.0
-            
-            point = DataPoint(
+        n_points = min(len(reduced_data), len(cluster_labels), len(original_data))
+        rows = original_data[:n_points]
+        labels = np.asarray(cluster_labels[:n_points])
+        
+        # Compute each attribute as a column over all points, then build
+        # DataPoint objects only at the end
+        anomaly_mask = np.zeros(n_points, dtype=bool)
+        anomaly_mask[[i for i in anomaly_indices if i < n_points]] = True
+        
+        palette = np.array(self.color_palette, dtype=object)
+        colors = palette[labels % len(palette)]
+        colors[labels == -1] = "#808080"  # Gray for noise (DBSCAN)
+        colors[anomaly_mask] = "#FF0000"  # Red for anomalies
+        
+        sizes = np.ones(n_points)
+        if config.size_column:
+            size_values = pd.to_numeric(
+                pd.Series([row.get(config.size_column) for row in rows], dtype=object),
+                errors="coerce",
+            ).to_numpy(dtype=float)
+            # Normalize size to 0.5-2.0 range; missing or non-numeric stay 1.0
+            valid = ~np.isnan(size_values)
+            sizes[valid] = np.clip(size_values[valid] / 100.0, 0.5, 2.0)
+        
+        return [
+            DataPoint.model_construct(
                 id=str(uuid.uuid4()),
-                position=(float(coords[0]), float(coords[1]), float(coords[2])),
+                position=(coords[0], coords[1], coords[2]),
                 color=color,
                 size=size,
-                cluster=int(cluster_id),
-                is_anomaly=i in anomaly_indices,
+                cluster=cluster_id,
+                is_anomaly=is_anomaly,
                 original_data=row_data,
             )
-            
-            points.append(point)
-        
-        return points
+            for coords, cluster_id, color, size, is_anomaly, row_data in zip(
+                reduced_data[:n_points].tolist(),
+                labels.tolist(),
+                colors.tolist(),
+                sizes.tolist(),
+                anomaly_mask.tolist(),
+                rows,
+            )
+        ]
     
     async def _create_cluster_info(
         self,
@@ -527,7 +517,7 @@ class MLProcessor:
             # Get cluster color from first point
             cluster_color = self.color_palette[label % len(self.color_palette)]
             
-            cluster = Cluster(
+            cluster = Cluster.model_construct(
                 id=int(label),
                 color=cluster_color,
                 count=len(cluster_indices),
@@ -0,0 +1,64 @@
+"""
+Compiled numeric kernels for dataset column statistics.
+"""
+
+from typing import Sequence, Tuple
+
+import numpy as np
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# Below this size JIT dispatch and array conversion cost more than they save
+NUMBA_MIN_SIZE = 1000
+
+
+def _welford(values: Sequence[float]) -> Tuple[int, float, float, float, float]:
+    """
+    Single-pass count, mean, sum of squared deviations, min and max.
+    
+    Args:
+        values: Float values (list or 1-D float64 array)
+        
+    Returns:
+        Tuple of (count, mean, m2, minimum, maximum)
+    """
+    n = 0
+    mean = 0.0
+    m2 = 0.0
+    minimum = np.inf
+    maximum = -np.inf
+    for value in values:
+        n += 1
+        delta = value - mean
+        mean += delta / n
+        m2 += delta * (value - mean)
+        if value < minimum:
+            minimum = value
+        if value > maximum:
+            maximum = value
+    return n, mean, m2, minimum, maximum
+
+
+if HAS_NUMBA:
+    # No fastmath: its no-inf/no-nan assumptions would break the min/max seeds
+    _welford_jit = njit(cache=True)(_welford)
+
+
+def column_moments(values: Sequence[float]) -> Tuple[int, float, float, float, float]:
+    """
+    Compute Welford moments, using the compiled kernel for large columns.
+    
+    Args:
+        values: Float values of a numeric column
+        
+    Returns:
+        Tuple of (count, mean, m2, minimum, maximum)
+    """
+    if HAS_NUMBA and len(values) >= NUMBA_MIN_SIZE:
+        n, mean, m2, minimum, maximum = _welford_jit(np.asarray(values, dtype=np.float64))
+        return int(n), float(mean), float(m2), float(minimum), float(maximum)
+    return _welford(values)
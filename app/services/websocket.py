@@ -4,16 +4,30 @@ Handles real-time updates for ML processing, dataset uploads, and user notificat
 """
 
 import asyncio
-import json
 import logging
 from typing import Dict, Set, List, Optional, Any
 from datetime import datetime
 from fastapi import WebSocket, WebSocketDisconnect
 from pydantic import BaseModel, ConfigDict
 
+from core.json import dumps
+
 logger = logging.getLogger(__name__)
 
 
+def _encode_message(message: Dict[str, Any]) -> str:
+    """
+    Encode a message as a JSON text frame.
+    
+    Args:
+        message: Message to encode
+        
+    Returns:
+        JSON text, encoded exactly as API responses are
+    """
+    return dumps(message).decode()
+
+
 class WebSocketMessage(BaseModel):
     """WebSocket message structure."""
     
@@ -167,6 +181,19 @@ class WebSocketManager:
             connection_id: Target connection ID
             message: Message to send
             
+        Returns:
+            True if message sent successfully
+        """
+        return await self._send_text(connection_id, _encode_message(message))
+    
+    async def _send_text(self, connection_id: str, text: str) -> bool:
+        """
+        Send an already encoded frame to a specific connection.
+        
+        Args:
+            connection_id: Target connection ID
+            text: Encoded JSON message
+            
         Returns:
             True if message sent successfully
         """
@@ -176,7 +203,7 @@ class WebSocketManager:
         connection_info = self.connections[connection_id]
         
         try:
-            await connection_info.websocket.send_text(json.dumps(message, default=str))
+            await connection_info.websocket.send_text(text)
             return True
         except Exception as e:
             logger.warning(f"Failed to send message to {connection_id}: {e}")
@@ -204,9 +231,11 @@ class WebSocketManager:
         
         sent_count = 0
         connection_ids = list(self.user_connections[user_id])
+        # Encode once for all recipients
+        text = _encode_message(message)
         
         for connection_id in connection_ids:
-            if await self.send_to_connection(connection_id, message):
+            if await self._send_text(connection_id, text):
                 sent_count += 1
         
         return sent_count
@@ -231,9 +260,11 @@ class WebSocketManager:
         
         sent_count = 0
         connection_ids = list(self.dataset_watchers[dataset_id])
+        # Encode once for all recipients
+        text = _encode_message(message)
         
         for connection_id in connection_ids:
-            if await self.send_to_connection(connection_id, message):
+            if await self._send_text(connection_id, text):
                 sent_count += 1
         
         return sent_count
@@ -250,9 +281,11 @@ class WebSocketManager:
         """
         sent_count = 0
         connection_ids = list(self.connections.keys())
+        # Encode once for all recipients
+        text = _encode_message(message)
         
         for connection_id in connection_ids:
-            if await self.send_to_connection(connection_id, message):
+            if await self._send_text(connection_id, text):
                 sent_count += 1
         
         return sent_count
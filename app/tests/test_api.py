@@ -0,0 +1,51 @@
+"""
+Tests for API request validation.
+"""
+
+import pytest
+from httpx import AsyncClient
+
+from models.dataset import Dataset
+
+
+class TestIdPathParams:
+    """Test UUID path parameters are validated before querying."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("path", [
+        "/api/datasets/not-a-uuid",
+        "/api/datasets/not-a-uuid/data",
+        "/api/datasets/not-a-uuid/stats",
+        "/api/users/not-a-uuid",
+        "/api/ml/results/not-a-uuid",
+    ])
+    async def test_malformed_id_rejected(self, async_client: AsyncClient, auth_headers: dict, path: str):
+        """Test malformed ids return 422 instead of reaching the database."""
+        response = await async_client.get(path, headers=auth_headers)
+        assert response.status_code == 422
+
+    @pytest.mark.asyncio
+    async def test_malformed_id_rejected_on_delete(self, async_client: AsyncClient, auth_headers: dict):
+        """Test malformed ids are rejected on writes too."""
+        response = await async_client.delete("/api/datasets/1' OR '1'='1", headers=auth_headers)
+        assert response.status_code == 422
+
+    @pytest.mark.asyncio
+    async def test_unknown_id_not_found(self, async_client: AsyncClient, auth_headers: dict):
+        """Test a well-formed id with no row returns 404."""
+        response = await async_client.get(
+            "/api/datasets/00000000-0000-4000-8000-0000000000ff", headers=auth_headers
+        )
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("form", [str.upper, lambda value: value.replace("-", "")])
+    async def test_id_forms_normalized(
+        self, async_client: AsyncClient, auth_headers: dict, test_dataset: Dataset, form
+    ):
+        """Test other spellings of a valid id resolve to the same row."""
+        dataset_id = test_dataset.id
+
+        response = await async_client.get(f"/api/datasets/{form(dataset_id)}", headers=auth_headers)
+        assert response.status_code == 200
+        assert response.json()["id"] == dataset_id
@@ -0,0 +1,147 @@
+"""
+Tests for the authentication service.
+"""
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.security import (
+    get_password_hash,
+    pwd_context,
+    verify_and_update_password,
+    verify_password,
+)
+from models.session import Session
+from models.user import User
+from schemas.user import UserCreate
+from services.auth import AuthService, InvalidCredentialsError, UserExistsError
+
+
+async def _bcrypt_user(test_session: AsyncSession) -> User:
+    user = User(
+        id="00000000-0000-4000-8000-000000000004",
+        email="legacy@example.com",
+        hashed_password=pwd_context.hash("legacypassword123", scheme="bcrypt"),
+        is_active=True,
+    )
+    test_session.add(user)
+    await test_session.commit()
+    return user
+
+
+def _registration(email: str = "new@example.com", **extra) -> UserCreate:
+    return UserCreate(
+        email=email,
+        password="newpassword123",
+        confirm_password="newpassword123",
+        first_name="New",
+        last_name="User",
+        **extra,
+    )
+
+
+class TestRegistration:
+    """Test single-statement registration."""
+
+    @pytest.mark.asyncio
+    async def test_register_creates_user_and_session(self, test_session: AsyncSession):
+        """Test registration inserts the user and an initial session."""
+        auth_service = AuthService(test_session)
+
+        tokens = await auth_service.register_user(
+            _registration(profile_image_url="https://example.com/a.png")
+        )
+
+        assert tokens.access_token and tokens.refresh_token
+        assert tokens.user.email == "new@example.com"
+        assert tokens.user.profile_image_url == "https://example.com/a.png"
+
+        user = await test_session.scalar(select(User).where(User.email == "new@example.com"))
+        assert user.id == tokens.user.id
+        assert user.email_local == "new"
+        assert user.is_active and not user.email_verified
+        assert verify_password("newpassword123", user.hashed_password)
+
+        sessions = await test_session.scalar(
+            select(func.count()).select_from(Session).where(Session.user_id == user.id)
+        )
+        assert sessions == 1
+
+    @pytest.mark.asyncio
+    async def test_register_duplicate_email(self, test_session: AsyncSession, test_user: User):
+        """Test the ON CONFLICT insert reports an existing email."""
+        auth_service = AuthService(test_session)
+        email = test_user.email  # the failed insert rolls back and expires test_user
+
+        with pytest.raises(UserExistsError):
+            await auth_service.register_user(_registration(email))
+
+        users = await test_session.scalar(
+            select(func.count()).select_from(User).where(User.email == email)
+        )
+        assert users == 1
+
+    @pytest.mark.asyncio
+    async def test_register_twice(self, test_session: AsyncSession):
+        """Test a second registration fails and leaves the session usable."""
+        auth_service = AuthService(test_session)
+        await auth_service.register_user(_registration())
+
+        with pytest.raises(UserExistsError):
+            await auth_service.register_user(_registration())
+
+        tokens = await auth_service.register_user(_registration("other@example.com"))
+        assert tokens.user.email == "other@example.com"
+
+
+class TestPasswordRehash:
+    """Test Argon2id hashing and the bcrypt upgrade on login."""
+
+    def test_new_hashes_use_argon2id(self):
+        """Test new passwords are hashed with Argon2id."""
+        hashed = get_password_hash("newpassword123")
+
+        assert hashed.startswith("$argon2id$")
+        assert verify_and_update_password("newpassword123", hashed) == (True, None)
+
+    def test_bcrypt_hash_needs_update(self):
+        """Test bcrypt hashes verify and come back with an Argon2id replacement."""
+        hashed = pwd_context.hash("legacypassword123", scheme="bcrypt")
+
+        verified, new_hash = verify_and_update_password("legacypassword123", hashed)
+        assert verified
+        assert new_hash.startswith("$argon2id$")
+        assert verify_password("legacypassword123", new_hash)
+
+        assert verify_and_update_password("wrongpassword123", hashed) == (False, None)
+
+    @pytest.mark.asyncio
+    async def test_login_rehashes_bcrypt(self, test_session: AsyncSession):
+        """Test a successful login stores the upgraded hash once."""
+        user = await _bcrypt_user(test_session)
+        auth_service = AuthService(test_session)
+
+        await auth_service.authenticate_user("legacy@example.com", "legacypassword123")
+        upgraded = user.hashed_password
+        assert upgraded.startswith("$argon2id$")
+        assert user.login_count == 1
+
+        await auth_service.authenticate_user("legacy@example.com", "legacypassword123")
+        assert user.hashed_password == upgraded
+        assert user.login_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_login_keeps_bcrypt(self, test_session: AsyncSession):
+        """Test a wrong password leaves the stored bcrypt hash alone."""
+        user = await _bcrypt_user(test_session)
+        legacy_hash = user.hashed_password
+        auth_service = AuthService(test_session)
+
+        with pytest.raises(InvalidCredentialsError):
+            await auth_service.authenticate_user("legacy@example.com", "wrongpassword123")
+
+        stored = await test_session.scalar(
+            select(User.hashed_password).where(User.email == "legacy@example.com")
+        )
+        assert stored == legacy_hash
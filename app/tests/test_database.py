@@ -0,0 +1,184 @@
+"""
+Tests for database helpers.
+"""
+
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert, select, update
+from sqlalchemy.dialects.postgresql import asyncpg
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database import utcnow, uuid7
+from models.dataset import Dataset
+from models.session import Session, Visualization
+from models.user import User
+from services.auth import AuthService
+
+
+class TestUUID7:
+    """Test time-ordered id generation."""
+
+    def test_version_and_variant(self):
+        """Test ids are RFC 9562 version 7 UUIDs."""
+        value = uuid.UUID(uuid7())
+
+        assert value.version == 7
+        assert value.variant == uuid.RFC_4122
+
+    def test_timestamp_prefix(self):
+        """Test the leading 48 bits are the current Unix time in milliseconds."""
+        before = time.time_ns() // 1_000_000
+        value = uuid.UUID(uuid7())
+        after = time.time_ns() // 1_000_000
+
+        assert before <= value.int >> 80 <= after
+
+    def test_ids_sort_by_creation_time(self):
+        """Test ids from successive milliseconds sort in creation order."""
+        ids = []
+        for _ in range(5):
+            ids.append(uuid7())
+            time.sleep(0.002)
+
+        assert sorted(ids) == ids
+        assert sorted(uuid.UUID(value).bytes for value in ids) == [
+            uuid.UUID(value).bytes for value in ids
+        ]
+
+    def test_ids_unique(self):
+        """Test ids within the same millisecond do not collide."""
+        ids = [uuid7() for _ in range(1000)]
+
+        assert len(set(ids)) == len(ids)
+
+    @pytest.mark.asyncio
+    async def test_sessions_get_uuid7_ids(self, test_session: AsyncSession, test_user: User):
+        """Test new sessions are keyed by time-ordered ids."""
+        auth_service = AuthService(test_session)
+        created = []
+        for _ in range(3):
+            session_data = await auth_service._create_user_session(test_user)
+            await test_session.flush()
+            created.append(session_data.id)
+            time.sleep(0.002)
+
+        assert all(uuid.UUID(value).version == 7 for value in created)
+
+        stored = await test_session.scalars(select(Session.id).order_by(Session.id))
+        assert list(stored) == created
+
+
+class TestUTCNow:
+    """Test the database-side UTC clock."""
+
+    def test_offset_compiles_to_interval_on_postgresql(self):
+        """Test offsets are added to the server clock as an interval."""
+        stmt = update(Session).values(expires_at=utcnow(timedelta(days=7)))
+        compiled = stmt.compile(dialect=asyncpg.dialect())
+
+        assert "TIMEZONE('utc', CURRENT_TIMESTAMP) + $1::INTERVAL" in str(compiled)
+        assert compiled.params["param_1"] == timedelta(days=7)
+
+    @pytest.mark.asyncio
+    async def test_extend_expiry(self, test_session: AsyncSession, test_user: User):
+        """Test repeated extensions each bind their own offset."""
+        session_data = await AuthService(test_session)._create_user_session(test_user)
+        await test_session.commit()
+
+        for days in (7, 30, 1):
+            await Session.extend_expiry(test_session, session_data.id, days)
+            expires_at = await test_session.scalar(
+                select(Session.expires_at).where(Session.id == session_data.id)
+            )
+            remaining = expires_at - datetime.utcnow()
+            assert timedelta(days=days, seconds=-5) < remaining <= timedelta(days=days)
+
+
+class TestMergeLikes:
+    """Test in-memory like merging against the cached lookup set."""
+
+    async def _visualization(self, test_session: AsyncSession, test_user: User, test_dataset: Dataset) -> str:
+        visualization = Visualization(
+            dataset_id=test_dataset.id,
+            user_id=test_user.id,
+            name="Clusters",
+            config={},
+            results={},
+            liked_by=["a"],
+        )
+        test_session.add(visualization)
+        await test_session.commit()
+        visualization_id = visualization.id
+        test_session.expunge_all()
+        return visualization_id
+
+    @pytest.mark.asyncio
+    async def test_loaded_row_builds_set(self, test_session: AsyncSession, test_user: User, test_dataset: Dataset):
+        """Test loading a row builds the set and merges keep it in step."""
+        visualization_id = await self._visualization(test_session, test_user, test_dataset)
+        visualization = await test_session.get(Visualization, visualization_id)
+        assert visualization._liked_set == {"a"}
+
+        assert visualization.merge_likes(["a", "b", "b", "c"]) == 2
+        assert visualization.merge_likes(["c", "d"]) == 1
+        assert visualization.liked_by == ["a", "b", "c", "d"]
+        assert visualization._liked_set == {"a", "b", "c", "d"}
+
+        await test_session.commit()
+        stored = await test_session.scalar(
+            select(Visualization.liked_by).where(Visualization.id == visualization_id)
+        )
+        assert stored == ["a", "b", "c", "d"]
+
+    @pytest.mark.asyncio
+    async def test_reassignment_resets_set(self, test_session: AsyncSession, test_user: User, test_dataset: Dataset):
+        """Test assigning liked_by drops the cached set."""
+        visualization_id = await self._visualization(test_session, test_user, test_dataset)
+        visualization = await test_session.get(Visualization, visualization_id)
+
+        visualization.liked_by = ["x"]
+        assert visualization._liked_set is None
+        assert visualization.merge_likes(["a", "x"]) == 1
+        assert visualization.liked_by == ["x", "a"]
+
+    @pytest.mark.asyncio
+    async def test_refresh_rebuilds_set(self, test_session: AsyncSession, test_user: User, test_dataset: Dataset):
+        """Test a server-side like is seen after the row is refreshed."""
+        visualization_id = await self._visualization(test_session, test_user, test_dataset)
+        visualization = await test_session.get(Visualization, visualization_id)
+
+        await test_session.execute(
+            update(Visualization)
+            .where(Visualization.id == visualization_id)
+            .values(liked_by=["a", "b"])
+            .execution_options(synchronize_session=False)
+        )
+        test_session.expire(visualization, ["liked_by"])
+        assert visualization._liked_set is None
+
+        await test_session.refresh(visualization, ["liked_by"])
+        assert visualization._liked_set == {"a", "b"}
+        assert visualization.merge_likes(["b"]) == 0
+
+
+class TestEmailLocal:
+    """Test email_local is always populated."""
+
+    @pytest.mark.asyncio
+    async def test_core_insert_derives_email_local(self, test_session: AsyncSession):
+        """Test inserts that bypass the ORM validator still fill email_local."""
+        await test_session.execute(
+            insert(User).values(email="core.user@example.com", hashed_password="x")
+        )
+        await test_session.commit()
+
+        user = await test_session.scalar(select(User).where(User.email == "core.user@example.com"))
+        assert user.email_local == "core.user"
+        assert user.full_name == "core.user"
+
+    def test_column_not_nullable(self):
+        """Test email_local is declared NOT NULL."""
+        assert User.__table__.c.email_local.nullable is False
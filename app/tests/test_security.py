@@ -0,0 +1,172 @@
+"""
+Tests for token and password helpers in core.security.
+"""
+
+import base64
+import json
+import time
+from datetime import timedelta
+
+import pytest
+from jose import jwt
+
+from core import security
+from core.security import (
+    TokenError,
+    create_access_token,
+    create_refresh_token,
+    verify_token,
+)
+
+
+USER_ID = "00000000-0000-4000-8000-000000000001"
+EMAIL = "test@example.com"
+
+
+def _b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+class TestHS256FastPath:
+    """Test the hand-rolled HS256 encoder and decoder against jose."""
+
+    def test_fast_path_token_decodes_with_jose(self):
+        """Test tokens from the fast path are valid jose tokens."""
+        token = create_access_token({"sub": USER_ID, "email": EMAIL})
+
+        header = jwt.get_unverified_header(token)
+        assert header == {"alg": "HS256", "typ": "JWT"}
+
+        payload = jwt.decode(token, security.settings.secret_key, algorithms=["HS256"])
+        assert payload["sub"] == USER_ID
+        assert payload["email"] == EMAIL
+        assert payload["token_type"] == "access"
+        assert payload["exp"] - payload["iat"] == security.ACCESS_TOKEN_EXPIRE_SECONDS
+
+    def test_fast_path_round_trip(self):
+        """Test verify_token accepts fast path tokens."""
+        token = create_access_token({"sub": USER_ID, "email": EMAIL})
+
+        token_data = verify_token(token)
+        assert token_data.user_id == USER_ID
+        assert token_data.email == EMAIL
+        assert token_data.token_type == "access"
+
+    def test_jose_token_accepted(self):
+        """Test verify_token accepts tokens encoded by jose."""
+        now = int(time.time())
+        token = jwt.encode(
+            {"sub": USER_ID, "email": EMAIL, "exp": now + 60, "iat": now, "token_type": "access"},
+            security.settings.secret_key,
+            algorithm="HS256",
+        )
+
+        assert verify_token(token).user_id == USER_ID
+
+    def test_non_ascii_claims_round_trip(self):
+        """Test claims needing JSON escapes survive the fast path."""
+        email = 'josé"+tag@example.com'
+        token = create_access_token({"sub": USER_ID, "email": email})
+
+        payload = jwt.decode(token, security.settings.secret_key, algorithms=["HS256"])
+        assert payload["email"] == email
+        assert verify_token(token).email == email
+
+    def test_tampered_signature_rejected(self):
+        """Test a token with a modified signature is rejected."""
+        token = create_access_token({"sub": USER_ID, "email": EMAIL})
+        header, payload, signature = token.split(".")
+        forged = _b64url(bytes(b ^ 1 for b in base64.urlsafe_b64decode(signature + "=")))
+
+        with pytest.raises(TokenError, match="Signature verification failed"):
+            verify_token(f"{header}.{payload}.{forged}")
+
+    def test_tampered_payload_rejected(self):
+        """Test a token with a swapped payload is rejected."""
+        token = create_access_token({"sub": USER_ID, "email": EMAIL})
+        header, _, signature = token.split(".")
+        payload = _b64url(json.dumps({
+            "sub": "00000000-0000-4000-8000-000000000002",
+            "email": "admin@example.com",
+            "exp": int(time.time()) + 60,
+            "iat": int(time.time()),
+            "token_type": "access",
+        }).encode())
+
+        with pytest.raises(TokenError, match="Signature verification failed"):
+            verify_token(f"{header}.{payload}.{signature}")
+
+    def test_other_key_rejected(self):
+        """Test a token signed with another key is rejected."""
+        token = security._encode_hs256_fixed(
+            b"another-key", USER_ID, EMAIL, int(time.time()) + 60, int(time.time()), "access"
+        )
+
+        with pytest.raises(TokenError):
+            verify_token(token)
+
+    def test_expired_token_rejected(self):
+        """Test an expired token is rejected on the fast path."""
+        token = create_access_token(
+            {"sub": USER_ID, "email": EMAIL}, expires_delta=timedelta(seconds=-1)
+        )
+
+        with pytest.raises(TokenError, match="expired"):
+            verify_token(token)
+
+    def test_wrong_token_type_rejected(self):
+        """Test a refresh token is not accepted as an access token."""
+        token = create_refresh_token({"sub": USER_ID, "email": EMAIL})
+
+        with pytest.raises(TokenError, match="Invalid token type"):
+            verify_token(token, "access")
+        assert verify_token(token, "refresh").user_id == USER_ID
+
+    def test_alg_none_rejected(self):
+        """Test an unsigned token falls through to jose and is rejected."""
+        now = int(time.time())
+        header = _b64url(b'{"alg":"none","typ":"JWT"}')
+        payload = _b64url(json.dumps({
+            "sub": USER_ID, "email": EMAIL, "exp": now + 60, "iat": now, "token_type": "access",
+        }).encode())
+        token = f"{header}.{payload}."
+
+        assert security._decode_hs256(token, security._SECRET_KEY_BYTES) is None
+        with pytest.raises(TokenError):
+            verify_token(token)
+
+    def test_other_algorithm_rejected(self):
+        """Test a token signed with HS512 is rejected under an HS256 config."""
+        now = int(time.time())
+        token = jwt.encode(
+            {"sub": USER_ID, "email": EMAIL, "exp": now + 60, "iat": now, "token_type": "access"},
+            security.settings.secret_key,
+            algorithm="HS512",
+        )
+
+        assert security._decode_hs256(token, security._SECRET_KEY_BYTES) is None
+        with pytest.raises(TokenError):
+            verify_token(token)
+
+    @pytest.mark.parametrize("suffix", ["", ".payload", ".payload.sig.extra", ".payload.!!!"])
+    def test_malformed_segments_rejected(self, suffix: str):
+        """Test tokens with missing, extra or undecodable segments are rejected."""
+        header = security._JWT_HS256_HEADER.decode("ascii")
+
+        with pytest.raises(TokenError):
+            verify_token(header + suffix)
+
+    def test_invalid_payload_rejected(self):
+        """Test a correctly signed but non-object payload is rejected."""
+        signing_input = security._JWT_HS256_HEADER + b"." + _b64url(b"[1, 2]").encode()
+        signature = security._hs256_sign(security._SECRET_KEY_BYTES, signing_input)
+        token = f"{signing_input.decode()}.{_b64url(signature)}"
+
+        with pytest.raises(TokenError, match="Invalid payload"):
+            verify_token(token)
+
+    @pytest.mark.parametrize("token", ["", "not-a-token", "a.b.c"])
+    def test_garbage_rejected(self, token: str):
+        """Test arbitrary strings are rejected."""
+        with pytest.raises(TokenError):
+            verify_token(token)
@@ -6,7 +6,7 @@ import pytest
 import json
 from unittest.mock import AsyncMock, patch
 from fastapi.testclient import TestClient
-from ..main import app
+from main import app
 from core.config import settings
 
 